@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import importlib.util
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing app loads the three predict.py scripts and their models; stub them out
+with patch.object(importlib.util, 'spec_from_file_location'), patch.object(importlib.util, 'module_from_spec', side_effect=lambda spec: MagicMock()):
+    import app
+
+class TestAnalysisService(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.app.test_client()
+
+        self.encodings = {"input_ids": [[0, 1, 2]], "attention_mask": [[1, 1, 1]]}
+        bias = MagicMock()
+        bias.tokenizer.return_value = self.encodings
+        bias.predict_bias_batch.side_effect = lambda texts, encodings=None: [{"center": 100.0} for _ in texts]
+        fake_news = MagicMock()
+        fake_news.predict_fake_news_batch.side_effect = lambda texts, encodings=None: [{"fake": 10.0, "true": 90.0} for _ in texts]
+        sentiment = MagicMock()
+        sentiment.analyze_sentiment_vader.side_effect = lambda text: {"sentiment": "Neutral", "text": text}
+
+        for name, module in (("bias", bias), ("fake_news", fake_news), ("sentiment", sentiment)):
+            patcher = patch.object(app, name, module)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.bias, self.fake_news, self.sentiment = bias, fake_news, sentiment
+
+    def test_analyze_single_text(self):
+        response = self.client.post("/analyze", json={"input_text": "Senate passes budget"})
+
+        # Assertions
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {
+            "bias": {"center": 100.0},
+            "fake_news": {"fake": 10.0, "true": 90.0},
+            "sentiment": {"sentiment": "Neutral", "text": "Senate passes budget"},
+        })
+        self.bias.predict_bias_batch.assert_called_once_with(["Senate passes budget"], encodings=self.encodings)
+
+    def test_analyze_list_of_texts(self):
+        response = self.client.post("/analyze", json={"input_texts": ["First article", "Second article"]})
+
+        # Assertions
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual(len(results), 2)
+        self.assertEqual([result["sentiment"]["text"] for result in results], ["First article", "Second article"])
+        for result in results:
+            self.assertEqual(set(result), {"bias", "fake_news", "sentiment"})
+        self.bias.predict_bias_batch.assert_called_once()  # Scored in one shared batch
+        self.assertEqual(self.client.post("/analyze", json={"input_texts": []}).get_json(), [])
+
+    def test_analyze_rejects_invalid_input(self):
+        invalid_bodies = [
+            {},
+            {"input_text": ""},
+            {"input_text": 123},
+            {"input_texts": "not a list"},
+            {"input_texts": ["ok", ""]},
+            {"input_texts": ["ok", 5]},
+            ["input_text"],
+            "input_text",
+            42,
+        ]
+
+        # Assertions
+        for body in invalid_bodies:
+            response = self.client.post("/analyze", json=body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.get_json())
+        self.assertEqual(self.client.post("/analyze", data="not json", content_type="application/json").status_code, 400)
+        self.bias.predict_bias_batch.assert_not_called()
+
+    def test_encodings_shared_only_with_matching_tokenizers(self):
+        with patch.object(app, "SHARED_TOKENIZER", True):
+            app.analyze_texts(["Article"])
+        with patch.object(app, "SHARED_TOKENIZER", False):
+            app.analyze_texts(["Article"])
+
+        # Assertions
+        shared, separate = self.fake_news.predict_fake_news_batch.call_args_list
+        self.assertIs(shared[1]["encodings"], self.encodings)
+        self.assertIsNone(separate[1]["encodings"])
+        for call in self.bias.predict_bias_batch.call_args_list:
+            self.assertIs(call[1]["encodings"], self.encodings)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+from flask import Flask, request, jsonify
+from flask_cors import CORS
+from pathlib import Path
+import importlib.util
+
+ROOT_DIR = Path(__file__).parent.parent
+
+def load_predict_module(name, path):
+    """Imports one of the predict.py scripts under a unique module name (they all share the file name)."""
+    spec = importlib.util.spec_from_file_location(name, ROOT_DIR / path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Load every model once; they stay warm for the life of the process
+bias = load_predict_module("bias_predict", "left_right_classification/predict.py")
+fake_news = load_predict_module("fake_news_predict", "fake_news/predict.py")
+sentiment = load_predict_module("sentiment_predict", "sentiment_analysis/predict.py")
+
+# Both classifiers are fine-tuned from RoBERTa checkpoints; when their tokenizers match,
+# articles are tokenized once and the encodings are shared between the two models
+SHARED_TOKENIZER = (
+    bias.tokenizer.get_vocab() == fake_news.tokenizer.get_vocab()
+    and bias.tokenizer.all_special_tokens == fake_news.tokenizer.all_special_tokens
+)
+
+app = Flask(__name__)
+CORS(app)
+
+def analyze_texts(texts):
+    """Runs the bias, fake news and sentiment models over the texts and returns one result per text."""
+    encodings = bias.tokenizer(texts, truncation=True, max_length=512)
+    bias_results = bias.predict_bias_batch(texts, encodings=encodings)
+    fake_news_results = fake_news.predict_fake_news_batch(texts, encodings=encodings if SHARED_TOKENIZER else None)
+
+    return [
+        {
+            "bias": bias_result,
+            "fake_news": fake_news_result,
+            "sentiment": sentiment.analyze_sentiment_vader(text),
+        }
+        for text, bias_result, fake_news_result in zip(texts, bias_results, fake_news_results)
+    ]
+
+@app.route("/analyze", methods=["POST"])
+def analyze():
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+
+    # A list of texts is scored in shared batches and answered with a list of results
+    input_texts = data.get("input_texts")
+    if input_texts is not None:
+        if not isinstance(input_texts, list) or not all(isinstance(text, str) and text for text in input_texts):
+            return jsonify({"error": "input_texts must be a list of non-empty strings"}), 400
+        if not input_texts:
+            return jsonify([])
+        return jsonify(analyze_texts(input_texts))
+
+    input_text = data.get("input_text")
+    if not input_text or not isinstance(input_text, str):
+        return jsonify({"error": "Text input is required"}), 400
+
+    return jsonify(analyze_texts([input_text])[0])
+
+if __name__ == "__main__":
+    app.run(host="127.0.0.1", port=9000, threaded=True)
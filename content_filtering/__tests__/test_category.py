@@ -1,15 +1,25 @@
 import unittest
 import sys
 import os
+import importlib
 import pandas as pd
 from collections import Counter
 import re
 import time
+import tempfile
+import threading
+import joblib
 from unittest.mock import patch, MagicMock
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.preprocessing import LabelEncoder
 
 # Add the parent directory to the path so we can import the category module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from category import preprocess, find_common_words, fit_eval_model, classify_article
+import category
+from category import preprocess, find_common_words, fit_eval_model, classify_article, classify_articles, classify_pending_articles, save_model, load_model, load_training_data
+from category import watch_change_stream, poll_pending_articles, watch_articles, make_vectorizer, update_model, benchmark_classifier, write_benchmark
+from pymongo.errors import OperationFailure, BulkWriteError
 
 class TestCategoryModule(unittest.TestCase):
     
@@ -137,6 +147,150 @@ class TestCategoryModule(unittest.TestCase):
         # Check that the function returns the expected category
         self.assertEqual(category, 'Sports')
         
+    @patch('category.tf_vec')
+    @patch('category.nb')
+    @patch('category.le')
+    def test_classify_articles(self, mock_le, mock_nb, mock_tf_vec):
+        """Test that classify_articles transforms and predicts all articles in one call."""
+        mock_tf_vec.transform.return_value = 'transformed_features'
+        mock_nb.predict.return_value = [1, 0]
+        mock_le.inverse_transform.return_value = ['Sports', 'Politics']
+        
+        categories = classify_articles([self.sample_article, 'Politics news about elections.'])
+        
+        mock_tf_vec.transform.assert_called_once()
+        self.assertEqual(len(mock_tf_vec.transform.call_args[0][0]), 2)
+        mock_nb.predict.assert_called_once_with('transformed_features')
+        self.assertEqual(categories, ['Sports', 'Politics'])
+        
+    def test_classify_articles_with_no_articles(self):
+        """Test classify_articles with an empty list."""
+        self.assertEqual(classify_articles([]), [])
+        
+    @patch('category.collection')
+    @patch('category.classify_articles')
+    def test_classify_pending_articles(self, mock_classify, mock_collection):
+        """Test that pending articles are classified in batches and written back with bulk_write."""
+        mock_collection.find.return_value.batch_size.return_value = [
+            {'_id': '1', 'content': 'Football match report'},
+            {'_id': '2', 'content': ''},
+            {'_id': '3', 'content': 'Election results'},
+            {'_id': '4', 'content': 'New smartphone released'},
+        ]
+        mock_classify.side_effect = lambda contents, pool: ['sport', 'politics', 'tech'][:len(contents)]
+        
+        updated = classify_pending_articles(batch_size=2, workers=1)
+        
+        # Articles without content are skipped
+        self.assertEqual(updated, 3)
+        self.assertEqual(mock_classify.call_count, 2)
+        self.assertEqual(mock_collection.bulk_write.call_count, 2)
+        
+        operations = mock_collection.bulk_write.call_args_list[0][0][0]
+        self.assertEqual([op._filter for op in operations], [{'_id': '1'}, {'_id': '3'}])
+        self.assertEqual(operations[0]._doc, {'$set': {'category': 'Sport'}})
+        
+    def test_load_training_data_uses_cache(self):
+        """Test that an unchanged training CSV is preprocessed once and then read from the cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'train.csv')
+            self.sample_df[['Text', 'Category']].to_csv(csv_path, index=False)
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            
+            with patch('category.preprocess_many', wraps=category.preprocess_many) as mock_preprocess_many:
+                first = load_training_data(csv_path, workers=1, cache_dir=cache_dir)
+                second = load_training_data(csv_path, workers=1, cache_dir=cache_dir)
+                
+                mock_preprocess_many.assert_called_once()
+            
+            self.assertEqual(first['Preprocessed_Text'].tolist(), second['Preprocessed_Text'].tolist())
+            self.assertEqual(first['Preprocessed_Text'].tolist(), [preprocess(text) for text in self.sample_df['Text']])
+            
+            # Changing the CSV invalidates the cache
+            self.sample_df[['Text', 'Category']].head(2).to_csv(csv_path, index=False)
+            changed = load_training_data(csv_path, workers=1, cache_dir=cache_dir)
+            self.assertEqual(len(changed), 2)
+            
+    @patch('category.update_categories')
+    def test_watch_change_stream_batches_inserts(self, mock_update):
+        """Test that inserted articles are classified in micro-batches of batch_size."""
+        changes = [{'fullDocument': {'_id': str(i), 'content': 'Football match report'}} for i in range(5)]
+        changes.insert(2, {'fullDocument': {'_id': 'empty', 'content': ''}})
+        stop = threading.Event()
+        
+        def try_next():
+            # Stop once every change has been delivered
+            if changes:
+                return changes.pop(0)
+            stop.set()
+            return None
+        
+        stream = MagicMock()
+        stream.alive = True
+        stream.try_next.side_effect = try_next
+        
+        watch_change_stream(stream, stop, batch_size=2, max_wait=60)
+        
+        batches = [[article['_id'] for article in call[0][0]] for call in mock_update.call_args_list]
+        self.assertEqual(batches, [['0', '1'], ['2', '3'], ['4']])
+        
+    @patch('category.collection')
+    @patch('category.update_categories')
+    def test_poll_pending_articles(self, mock_update, mock_collection):
+        """Test that polling classifies waiting articles and skips articles without content."""
+        stop = threading.Event()
+        mock_collection.find.return_value.limit.return_value = [
+            {'_id': '1', 'content': 'Election results'},
+            {'_id': '2', 'content': ''},
+        ]
+        mock_update.side_effect = lambda batch: stop.set()
+        
+        poll_pending_articles(stop, batch_size=10, poll_interval=0)
+        
+        mock_update.assert_called_once_with([{'_id': '1', 'content': 'Election results'}])
+        mock_collection.find.assert_called_once_with({'category': 'General'}, {'content': 1})
+        
+    @patch('category.collection')
+    @patch('category.poll_pending_articles')
+    def test_watch_articles_falls_back_to_polling(self, mock_poll, mock_collection):
+        """Test that a server without change streams is polled instead."""
+        mock_collection.watch.side_effect = OperationFailure('The $changeStream stage is only supported on replica sets', code=40573)
+        stop = threading.Event()
+        
+        watch_articles(stop=stop, batch_size=8, poll_interval=1)
+        
+        mock_poll.assert_called_once_with(stop, 8, 1)
+        
+    @patch('category.collection')
+    @patch('category.classify_pending_articles')
+    @patch('category.update_categories')
+    @patch('category.poll_pending_articles')
+    def test_watch_articles_raises_write_errors(self, mock_poll, mock_update, mock_classify, mock_collection):
+        """Test that a failed write is raised rather than mistaken for missing change stream support."""
+        stream = mock_collection.watch.return_value
+        stream.alive = True
+        stream.try_next.return_value = {'fullDocument': {'_id': '1', 'content': 'Election results'}}
+        mock_update.side_effect = BulkWriteError({'writeErrors': [{'code': 121}]})
+        
+        with self.assertRaises(BulkWriteError):
+            watch_articles(stop=threading.Event(), batch_size=1)
+        
+        mock_poll.assert_not_called()
+        
+    @patch('category.collection')
+    @patch('category.classify_pending_articles')
+    @patch('category.watch_change_stream')
+    def test_watch_articles_reopens_closed_stream(self, mock_watch_stream, mock_classify, mock_collection):
+        """Test that a change stream closed by the server is reopened and caught up."""
+        stop = threading.Event()
+        # The server closes the first stream; the worker is stopped on the second
+        mock_watch_stream.side_effect = lambda stream, stop_event, *args: stop.set() if mock_watch_stream.call_count == 2 else None
+        
+        watch_articles(stop=stop, batch_size=8, max_wait=0)
+        
+        self.assertEqual(mock_collection.watch.call_count, 2)
+        self.assertEqual(mock_classify.call_count, 2)
+        
     def test_preprocess_with_empty_text(self):
         """Test the preprocess function with empty text."""
         processed = preprocess("")
@@ -172,5 +326,97 @@ class TestCategoryModule(unittest.TestCase):
                         # Verify that the TF-IDF vectorizer was called with the joined preprocessed text
                         mock_transform.assert_called_once_with(['sport foundation culture'])
 
+    def test_save_and_load_model(self):
+        """Test that a saved model artifact restores a working vectorizer, classifier and encoder."""
+        texts = [' '.join(tokens) for tokens in self.sample_df['Preprocessed_Text']]
+        
+        with patch('category.tf_vec', TfidfVectorizer()), patch('category.nb', MultinomialNB()), patch('category.le', LabelEncoder()):
+            features = category.tf_vec.fit_transform(texts)
+            category.nb.fit(features, category.le.fit_transform(self.sample_df['Category']))
+            
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = os.path.join(tmp_dir, 'category_model.joblib')
+                save_model(path)
+                
+                # Replace the fitted components so the classification below must use the loaded ones
+                category.tf_vec, category.nb, category.le = TfidfVectorizer(), MultinomialNB(), LabelEncoder()
+                artifact = load_model(path)
+            
+            self.assertEqual(artifact['format_version'], category.MODEL_FORMAT_VERSION)
+            self.assertEqual(list(category.le.classes_), sorted(self.sample_df['Category']))
+            self.assertEqual(classify_article('football and basketball sports'), 'Sports')
+            
+    def test_load_model_with_wrong_format_version(self):
+        """Test that an artifact from a different format version is rejected."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'category_model.joblib')
+            joblib.dump({'format_version': category.MODEL_FORMAT_VERSION + 1}, path)
+            
+            with self.assertRaises(ValueError):
+                load_model(path)
+
+    def test_update_hashing_model(self):
+        """Test that a hashing-feature model learns from newly labelled articles without refitting."""
+        texts = [' '.join(tokens) for tokens in self.sample_df['Preprocessed_Text']]
+        
+        with patch('category.tf_vec', make_vectorizer('hashing')), patch('category.nb', MultinomialNB()), \
+             patch('category.le', LabelEncoder()), patch('category.feature_type', 'hashing'):
+            features = category.tf_vec.fit_transform(texts)
+            category.nb.fit(features, category.le.fit_transform(self.sample_df['Category']))
+            self.assertNotEqual(classify_article('cricket wicket batsman'), 'Sports')
+            
+            added = update_model(['Cricket wicket batsman'] * 3, ['Sports'] * 3, pool=None)
+            
+            self.assertEqual(added, 3)
+            self.assertEqual(classify_article('cricket wicket batsman'), 'Sports')
+            
+            with self.assertRaises(ValueError):
+                update_model(['A new category'], ['Weather'])
+    
+    def test_update_tfidf_model_is_rejected(self):
+        """Test that a TF-IDF model must be retrained rather than updated."""
+        with patch('category.feature_type', 'tfidf'):
+            with self.assertRaises(ValueError):
+                update_model(['Cricket wicket batsman'], ['Sports'])
+
+    def test_benchmark_classifier(self):
+        """Test that a benchmark row reports every field and can be written as CSV."""
+        texts = [' '.join(tokens) for tokens in self.sample_df['Preprocessed_Text']]
+        labels = LabelEncoder().fit_transform(self.sample_df['Category'])
+        vectorizer = TfidfVectorizer().fit(texts)
+        
+        row = benchmark_classifier(MultinomialNB(), vectorizer, texts, labels, texts, labels, latency_samples=2)
+        
+        self.assertEqual(list(row), category.BENCHMARK_FIELDS)
+        self.assertEqual(row['model'], 'MultinomialNB')
+        self.assertEqual(row['macro_f1'], 1.0)
+        self.assertLessEqual(row['latency_p50_ms'], row['latency_p99_ms'])
+        self.assertGreater(row['model_size_kb'], 0)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'benchmark.csv')
+            write_benchmark([row], path)
+            written = pd.read_csv(path)
+        
+        self.assertEqual(list(written.columns), category.BENCHMARK_FIELDS)
+        self.assertEqual(written['model'].tolist(), ['MultinomialNB'])
+
+    def test_import_has_no_side_effects(self):
+        """Test that importing the module neither connects to MongoDB nor downloads NLTK data."""
+        with patch('pymongo.MongoClient') as mock_client, patch('nltk.download') as mock_download:
+            importlib.reload(category)
+            
+            self.assertIsNone(category.client)
+            self.assertIsNone(category.collection)
+            mock_client.assert_not_called()
+            mock_download.assert_not_called()
+            
+            # The client is only created when the collection is first needed
+            self.assertIs(category.get_collection(), mock_client.return_value[category.MONGO_DB][category.MONGO_COLLECTION])
+            mock_client.assert_called_once_with(category.MONGO_URI)
+        
+        category.client = None
+        category.collection = None
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
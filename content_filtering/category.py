@@ -188,37 +188,172 @@
 
 import pandas as pd
 import re 
+from functools import lru_cache
 
-import nltk
-nltk.download('punkt_tab')
-nltk.download('stopwords')
-nltk.download('wordnet')
-from nltk.tokenize import RegexpTokenizer
 from collections import Counter 
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
 
 import numpy as np 
 
-from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
+from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer, HashingVectorizer
+from sklearn.pipeline import make_pipeline
 from sklearn.model_selection import train_test_split
-from sklearn import svm
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier
-from sklearn.tree import DecisionTreeClassifier
-
-from sklearn.metrics  import classification_report
-from sklearn import metrics
+from sklearn.metrics  import classification_report, f1_score
 from sklearn.preprocessing import LabelEncoder
 import time
-from pymongo import MongoClient
+import argparse
+import datetime
+import os
+import hashlib
+import threading
+import joblib
+import sklearn
+import pickle
+import json
+import csv
+import importlib.util
+from multiprocessing import Pool
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
+
+# Importing this module has no side effects: NLTK data is downloaded when first needed,
+# the MongoDB client is created by get_collection() and the model is loaded by the
+# commands that use it. nltk and the benchmark-only classifiers take seconds to import,
+# so they are imported on first use too.
 
 # MongoDB Atlas connection
 MONGO_URI = "mongodb://localhost:27017"
-client = MongoClient(MONGO_URI)
-db = client["news_db"]
-collection = db["articles"]
+MONGO_DB = "news_db"
+MONGO_COLLECTION = "articles"
+client = None
+collection = None
+
+# NLTK resources used by preprocess(), by download name and nltk.data path
+NLTK_RESOURCES = {
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+}
+
+# Training data and the persisted model artifact
+TRAIN_CSV_PATH = 'BBC News Train.csv'
+MODEL_PATH = 'category_model.joblib'
+# Bump when the layout of the saved artifact changes
+MODEL_FORMAT_VERSION = 1
+
+# Preprocessed training corpora are cached here, keyed by the CSV content hash.
+# Bump PREPROCESS_VERSION whenever preprocess() output changes to invalidate the cache.
+PREPROCESS_CACHE_DIR = '.preprocess_cache'
+PREPROCESS_VERSION = 1
+
+# Articles fetched, classified and written back per round trip in classify_pending_articles()
+CLASSIFY_BATCH_SIZE = 500
+
+# watch command: a micro-batch is classified once it holds WATCH_BATCH_SIZE articles or its
+# oldest article has waited WATCH_MAX_WAIT_SECONDS; without change streams the collection
+# is polled every WATCH_POLL_INTERVAL_SECONDS
+WATCH_BATCH_SIZE = 64
+WATCH_MAX_WAIT_SECONDS = 2.0
+WATCH_POLL_INTERVAL_SECONDS = 5.0
+# Server error code for "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+# Feature pipelines: "tfidf" learns a vocabulary and must be refit to pick up new words;
+# "hashing" hashes words into HASHING_N_FEATURES columns, so its memory is fixed and
+# the classifier can be updated incrementally with update_model()
+FEATURE_TYPES = ("tfidf", "hashing")
+HASHING_N_FEATURES = 2 ** 18
+
+# Candidate classifiers for the benchmark command, the ones compared in the notebook code above
+# (module, class, keyword arguments); xgboost is optional
+BENCHMARK_MODELS = {
+    "MultinomialNB": ("sklearn.naive_bayes", "MultinomialNB", {}),
+    "SVC": ("sklearn.svm", "SVC", {}),
+    "AdaBoostClassifier": ("sklearn.ensemble", "AdaBoostClassifier", {"random_state": 1}),
+    "GradientBoostingClassifier": ("sklearn.ensemble", "GradientBoostingClassifier", {"random_state": 1}),
+    "XGBClassifier": ("xgboost", "XGBClassifier", {"random_state": 1}),
+    "DecisionTreeClassifier": ("sklearn.tree", "DecisionTreeClassifier", {"random_state": 1}),
+}
+BENCHMARK_LATENCY_SAMPLES = 200
+BENCHMARK_FIELDS = ["model", "train_time_s", "latency_p50_ms", "latency_p99_ms",
+                    "throughput_articles_per_s", "model_size_kb", "macro_f1"]
+
+# Model components, fitted by train_model() or restored by load_model()
+tf_vec = TfidfVectorizer()
+nb = MultinomialNB()
+le = LabelEncoder()
+feature_type = "tfidf"
+
+# Preprocessing resources shared by every preprocess() call
+NON_ALPHA = re.compile(r"[^a-zA-Z]")
+
+def get_collection():
+    """
+    Function: return the articles collection, connecting to MongoDB on first use
+    Return:
+      (pymongo.collection.Collection): the articles collection
+    """
+    global client, collection
+    if collection is None:
+        client = MongoClient(MONGO_URI)
+        collection = client[MONGO_DB][MONGO_COLLECTION]
+    return collection
+
+@lru_cache(maxsize=None)
+def ensure_nltk_data():
+    """
+    Function: download the NLTK resources preprocess() needs, skipping those already installed
+    """
+    import nltk
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name, quiet=True)
+
+@lru_cache(maxsize=None)
+def get_tokenizer():
+    """
+    Function: import the NLTK word tokenizer once
+    Return:
+      (function): nltk.tokenize.word_tokenize
+    """
+    ensure_nltk_data()
+    from nltk.tokenize import word_tokenize
+    return word_tokenize
+
+@lru_cache(maxsize=None)
+def get_lemmatizer():
+    """
+    Function: create the WordNet lemmatizer once
+    Return:
+      (nltk.stem.WordNetLemmatizer): the lemmatizer
+    """
+    ensure_nltk_data()
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+@lru_cache(maxsize=None)
+def get_stop_words():
+    """
+    Function: load the English stop words once
+    Return:
+      (frozenset of str): the stop words, for constant-time membership tests
+    """
+    ensure_nltk_data()
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english"))
+
+@lru_cache(maxsize=100000)
+def lemmatize(word):
+    """
+    Function: return the root form of a word, caching repeated words
+    Args:
+      word(str): a lowercase token
+    Return:
+      (str): the lemmatized word
+    """
+    return get_lemmatizer().lemmatize(word)
 
 # Text preprocessing
 def preprocess(text):
@@ -231,20 +366,82 @@ def preprocess(text):
     """
     
     # Normalize text
-    text = re.sub(r"[^a-zA-Z]", " ", str(text).lower())
+    text = NON_ALPHA.sub(" ", str(text).lower())
     
     # Tokenize text
-    token = word_tokenize(text)
+    token = get_tokenizer()(text)
     
     # Remove stop words
-    stop = stopwords.words("english")
+    stop = get_stop_words()
     words = [t for t in token if t not in stop]
     
     # Lemmatization
-    lem = [WordNetLemmatizer().lemmatize(w) for w in words]
+    lem = [lemmatize(w) for w in words]
     
     return lem
 
+def preprocess_many(texts, pool=None, chunksize=32):
+    """
+    Function: preprocess several texts, optionally spread over a process pool
+    Args:
+      texts(list of str): the articles
+      pool(multiprocessing.Pool): worker processes to use, or None to preprocess in this process
+      chunksize(int): texts sent to a worker at a time
+    Return:
+      (list of list of str): the preprocess() output for each text, in order
+    """
+    if pool is None:
+        return [preprocess(text) for text in texts]
+    return list(pool.imap(preprocess, texts, chunksize=chunksize))
+
+def file_digest(path):
+    """
+    Function: compute the SHA-256 hash of a file's contents
+    Args:
+      path(str): the file
+    Return:
+      (str): the hex digest
+    """
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def load_training_data(csv_path, workers=None, cache_dir=PREPROCESS_CACHE_DIR):
+    """
+    Function: read the training CSV and add its Preprocessed_Text column, preprocessing
+    in parallel and reusing the cached result when the CSV has not changed
+    Args:
+      csv_path(str): path of the training CSV
+      workers(int): preprocessing processes; 1 preprocesses in this process
+      cache_dir(str): directory of cached corpora, or None to disable caching
+    Return:
+      df1(dataframe): the training data with a Preprocessed_Text column
+    """
+    df1 = pd.read_csv(csv_path)
+
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{file_digest(csv_path)}-v{PREPROCESS_VERSION}.joblib")
+        if os.path.exists(cache_path):
+            df1["Preprocessed_Text"] = joblib.load(cache_path)
+            return df1
+
+    texts = df1['Text'].tolist()
+    if workers == 1:
+        tokens = preprocess_many(texts)
+    else:
+        with Pool(workers) as pool:
+            tokens = preprocess_many(texts, pool, chunksize=64)
+    df1["Preprocessed_Text"] = tokens
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        joblib.dump(tokens, cache_path)
+
+    return df1
+
 # Find the common words in each category
 def find_common_words(df, category):
     """
@@ -323,47 +520,475 @@ def classify_article(content):
 
     return category
 
-df1 = pd.read_csv('BBC News Train.csv')
-category = list(df1['Category'].unique())
-df1["Preprocessed_Text"] = df1['Text'].apply(lambda x: preprocess(x))
+def classify_articles(contents, pool=None):
+    """
+    Function: Classify several articles with one TF-IDF transform and one prediction.
+    Args:
+      contents (list of str): The texts of the articles.
+      pool (multiprocessing.Pool): Worker processes for preprocessing, or None.
+    Returns:
+      categories (list of str): The predicted category of each article, in order.
+    """
+    if not contents:
+        return []
 
-df1['Preprocessed_Text2'] = df1['Preprocessed_Text'].apply(' '.join)
+    # Text preprocessing
+    artcls = [' '.join(tokens) for tokens in preprocess_many(contents, pool)]
 
-X = df1['Preprocessed_Text2']
-y = df1['Category']
+    # Use TF-IDF for feature extraction and predict using MultinomialNB model
+    predict = nb.predict(tf_vec.transform(artcls))
 
-# Split data
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
+    # Convert numerical predictions back to category names
+    return list(le.inverse_transform(predict))
 
-# Use TF-IDF
-tf_vec = TfidfVectorizer()
-train_features = tf_vec.fit(X_train)
-train_features = tf_vec.transform(X_train)
-test_features = tf_vec.transform(X_test)
+def make_vectorizer(features):
+    """
+    Function: create an unfitted feature pipeline.
+    Args:
+      features(str): one of FEATURE_TYPES
+    Return:
+      a transformer mapping preprocessed texts to TF-IDF weighted features
+    """
+    if features == "tfidf":
+        return TfidfVectorizer()
+    if features == "hashing":
+        return make_pipeline(HashingVectorizer(n_features=HASHING_N_FEATURES, alternate_sign=False, norm=None), TfidfTransformer())
+    raise ValueError(f"Unknown feature type {features!r}, expected one of {FEATURE_TYPES}")
 
-# Initialize the models
-nb = MultinomialNB()
+def train_model(csv_path=TRAIN_CSV_PATH, workers=None, cache_dir=PREPROCESS_CACHE_DIR, features="tfidf"):
+    """
+    Function: fit the TF-IDF vectorizer, classifier and label encoder on the training CSV.
+    Args:
+      csv_path(str): path of the BBC News training CSV
+      workers(int): preprocessing processes; 1 preprocesses in this process
+      cache_dir(str): preprocessed corpus cache directory, or None to disable caching
+      features(str): feature pipeline, one of FEATURE_TYPES
+    Return:
+      results(dictionary): fit_eval_model results keyed by classifier name
+    """
+    global tf_vec, nb, le, feature_type
 
-# Encode target labels as integers
-le = LabelEncoder()
-y_train_encoded = le.fit_transform(y_train)
-y_test_encoded = le.transform(y_test)
+    df1 = load_training_data(csv_path, workers, cache_dir)
+
+    df1['Preprocessed_Text2'] = df1['Preprocessed_Text'].apply(' '.join)
 
-# Fit and evaluate models
-results = {}
-for cls in [nb]:  
-    cls_name = cls.__class__.__name__
-    results[cls_name] = fit_eval_model(cls, train_features, y_train_encoded, test_features, y_test_encoded)
+    X = df1['Preprocessed_Text2']
+    y = df1['Category']
 
-# Fetch and classify news articles from MongoDB
-articles = collection.find({"category": "General"})  # Filter articles needing classification
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
 
-for article in articles:
-    content = article.get("content", "")
+    # Use TF-IDF
+    tf_vec = make_vectorizer(features)
+    feature_type = features
+    train_features = tf_vec.fit_transform(X_train)
+    test_features = tf_vec.transform(X_test)
 
-    if content:
-        category_name = classify_article(content)
-        collection.update_one({"_id": article["_id"]}, {"$set": {"category": category_name.capitalize()}})
-        print(f"Updated article {article['_id']} with category: {category_name.capitalize()}")
+    # Initialize the models
+    nb = MultinomialNB()
 
-print("Category classification and update completed.")
+    # Encode target labels as integers
+    le = LabelEncoder()
+    y_train_encoded = le.fit_transform(y_train)
+    y_test_encoded = le.transform(y_test)
+
+    # Fit and evaluate models
+    results = {}
+    for cls in [nb]:  
+        cls_name = cls.__class__.__name__
+        results[cls_name] = fit_eval_model(cls, train_features, y_train_encoded, test_features, y_test_encoded)
+
+    return results
+
+def benchmark_classifier(model, vectorizer, X_train, y_train, X_test, y_test, latency_samples=BENCHMARK_LATENCY_SAMPLES):
+    """
+    Function: train a classifier and measure its speed, size and quality.
+    Latency and throughput cover feature extraction and prediction of preprocessed text.
+    Args:
+      model: machine learning classifier
+      vectorizer: fitted feature pipeline
+      X_train, X_test(list of str): preprocessed texts joined with spaces
+      y_train, y_test: encoded labels
+      latency_samples(int): test articles classified one at a time
+    Return:
+      results(dictionary): one row of the benchmark table
+    """
+    train_features = vectorizer.transform(X_train)
+
+    start = time.perf_counter()
+    model.fit(train_features, y_train)
+    train_time = time.perf_counter() - start
+
+    # Per-article latency, as classify_article() sees it
+    timings = []
+    for text in X_test[:latency_samples]:
+        start = time.perf_counter()
+        model.predict(vectorizer.transform([text]))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Batch throughput, as classify_articles() sees it
+    start = time.perf_counter()
+    test_predicted = model.predict(vectorizer.transform(X_test))
+    batch_time = time.perf_counter() - start
+
+    return {
+        "model": model.__class__.__name__,
+        "train_time_s": train_time,
+        "latency_p50_ms": float(np.percentile(timings, 50)),
+        "latency_p99_ms": float(np.percentile(timings, 99)),
+        "throughput_articles_per_s": len(X_test) / batch_time,
+        "model_size_kb": len(pickle.dumps(model)) / 1024,
+        "macro_f1": f1_score(y_test, test_predicted, average="macro"),
+    }
+
+def benchmark_model_available(name):
+    """
+    Function: check whether a benchmark candidate's library is installed
+    Args:
+      name(str): a BENCHMARK_MODELS key
+    Return:
+      (bool): True if the classifier can be created
+    """
+    module_name = BENCHMARK_MODELS[name][0]
+    return importlib.util.find_spec(module_name.split(".")[0]) is not None
+
+def make_benchmark_model(name):
+    """
+    Function: import and create an unfitted benchmark candidate
+    Args:
+      name(str): a BENCHMARK_MODELS key
+    Return:
+      an unfitted classifier
+    """
+    module_name, class_name, kwargs = BENCHMARK_MODELS[name]
+    return getattr(importlib.import_module(module_name), class_name)(**kwargs)
+
+def benchmark_models(csv_path=TRAIN_CSV_PATH, models=None, workers=None, cache_dir=PREPROCESS_CACHE_DIR,
+                     features="tfidf", latency_samples=BENCHMARK_LATENCY_SAMPLES, random_state=42):
+    """
+    Function: benchmark candidate classifiers on the same split and features.
+    Args:
+      csv_path(str): path of the BBC News training CSV
+      models(list of str): BENCHMARK_MODELS keys, default all that are installed
+      workers(int): preprocessing processes; 1 preprocesses in this process
+      cache_dir(str): preprocessed corpus cache directory, or None to disable caching
+      features(str): feature pipeline, one of FEATURE_TYPES
+      latency_samples(int): test articles classified one at a time per model
+      random_state(int): seed of the train/test split
+    Return:
+      rows(list of dictionary): one benchmark_classifier() row per model
+    """
+    if models is None:
+        models = [name for name in BENCHMARK_MODELS if benchmark_model_available(name)]
+    for name in models:
+        if not benchmark_model_available(name):
+            raise ImportError(f"{BENCHMARK_MODELS[name][0]} is not installed; install it or leave out {name}")
+
+    df1 = load_training_data(csv_path, workers, cache_dir)
+    X = df1['Preprocessed_Text'].apply(' '.join)
+    X_train, X_test, y_train, y_test = train_test_split(X, df1['Category'], test_size=0.2,
+                                                        random_state=random_state, stratify=df1['Category'])
+
+    vectorizer = make_vectorizer(features).fit(X_train)
+    encoder = LabelEncoder()
+    y_train_encoded = encoder.fit_transform(y_train)
+    y_test_encoded = encoder.transform(y_test)
+
+    return [
+        benchmark_classifier(make_benchmark_model(name), vectorizer, X_train.tolist(), y_train_encoded,
+                             X_test.tolist(), y_test_encoded, latency_samples)
+        for name in models
+    ]
+
+def write_benchmark(rows, path):
+    """
+    Function: write benchmark rows as CSV when path ends in .csv, JSON otherwise.
+    Args:
+      rows(list of dictionary): benchmark_models() output
+      path(str): output file
+    """
+    with open(path, "w", newline="") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=BENCHMARK_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, indent=2)
+
+def save_model(path=MODEL_PATH):
+    """
+    Function: save the fitted vectorizer, classifier and label encoder as one artifact.
+    Args:
+      path(str): where to write the artifact
+    """
+    joblib.dump({
+        "format_version": MODEL_FORMAT_VERSION,
+        "sklearn_version": sklearn.__version__,
+        "trained_at": datetime.datetime.utcnow().isoformat(),
+        "features": feature_type,
+        "vectorizer": tf_vec,
+        "classifier": nb,
+        "encoder": le,
+    }, path)
+
+def load_model(path=MODEL_PATH):
+    """
+    Function: restore the vectorizer, classifier and label encoder saved by save_model().
+    Args:
+      path(str): the artifact to load
+    Return:
+      artifact(dictionary): the loaded artifact, including its metadata
+    """
+    global tf_vec, nb, le, feature_type
+
+    artifact = joblib.load(path)
+    if artifact.get("format_version") != MODEL_FORMAT_VERSION:
+        raise ValueError(f"{path} has model format {artifact.get('format_version')}, expected {MODEL_FORMAT_VERSION}; "
+                         "retrain it with the train command")
+    if artifact["sklearn_version"] != sklearn.__version__:
+        print(f"⚠️ {path} was trained with scikit-learn {artifact['sklearn_version']}, running {sklearn.__version__}")
+
+    tf_vec, nb, le = artifact["vectorizer"], artifact["classifier"], artifact["encoder"]
+    feature_type = artifact.get("features", "tfidf")
+    return artifact
+
+def update_model(texts, categories, pool=None):
+    """
+    Function: fold newly labelled articles into a hashing-feature model with partial_fit.
+    The IDF weights stay as fitted at training time; only the classifier is updated.
+    Args:
+      texts(list of str): the article texts
+      categories(list of str): their categories, which must already be known to the model
+      pool(multiprocessing.Pool): worker processes for preprocessing, or None
+    Return:
+      (int): the number of articles added
+    """
+    if feature_type != "hashing":
+        raise ValueError("Only models trained with --features hashing can be updated incrementally; retrain instead")
+
+    unknown = set(categories) - set(le.classes_)
+    if unknown:
+        raise ValueError(f"Unknown categories {sorted(unknown)}; retrain to add new categories")
+
+    artcls = [' '.join(tokens) for tokens in preprocess_many(texts, pool)]
+    nb.partial_fit(tf_vec.transform(artcls), le.transform(categories))
+    return len(artcls)
+
+def update_categories(articles, pool=None):
+    """
+    Function: classify a batch of articles and write their categories back with one bulk_write.
+    Args:
+      articles(list of dict): articles with "_id" and non-empty "content"
+      pool(multiprocessing.Pool): worker processes for preprocessing, or None
+    Return:
+      (int): the number of articles updated
+    """
+    categories = classify_articles([article["content"] for article in articles], pool)
+    get_collection().bulk_write([
+        UpdateOne({"_id": article["_id"]}, {"$set": {"category": category_name.capitalize()}})
+        for article, category_name in zip(articles, categories)
+    ], ordered=False)
+    print(f"Updated {len(articles)} articles")
+    return len(articles)
+
+def classify_pending_articles(batch_size=CLASSIFY_BATCH_SIZE, workers=None):
+    """
+    Function: classify the articles still in the "General" category and update them in MongoDB.
+    Args:
+      batch_size(int): articles classified together and written back with one bulk_write
+      workers(int): preprocessing processes; 1 preprocesses in this process
+    Return:
+      updated(int): the number of articles updated
+    """
+    pool = Pool(workers) if workers != 1 else None
+    updated = 0
+
+    try:
+        # Fetch and classify news articles from MongoDB
+        articles = get_collection().find({"category": "General"}, {"content": 1}).batch_size(batch_size)  # Filter articles needing classification
+
+        batch = []
+        for article in articles:
+            if article.get("content"):
+                batch.append(article)
+            if len(batch) == batch_size:
+                updated += update_categories(batch, pool)
+                batch = []
+        if batch:
+            updated += update_categories(batch, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    print(f"Category classification and update completed. {updated} articles updated.")
+    return updated
+
+def watch_change_stream(stream, stop, batch_size=WATCH_BATCH_SIZE, max_wait=WATCH_MAX_WAIT_SECONDS):
+    """
+    Function: classify "General" articles as they arrive on an open change stream.
+    Args:
+      stream: change stream over inserts into the articles collection
+      stop(threading.Event): set to stop watching
+      batch_size(int): most articles classified together
+      max_wait(float): seconds the oldest waiting article may wait for its batch to fill
+    """
+    batch = []
+    deadline = None
+
+    while not stop.is_set() and stream.alive:
+        change = stream.try_next()
+        if change is not None:
+            article = change["fullDocument"]
+            if article.get("content"):
+                batch.append(article)
+                deadline = deadline or time.monotonic() + max_wait
+
+        if batch and (len(batch) >= batch_size or time.monotonic() >= deadline):
+            update_categories(batch)
+            batch = []
+            deadline = None
+
+    if batch:
+        update_categories(batch)
+
+def poll_pending_articles(stop, batch_size=WATCH_BATCH_SIZE, poll_interval=WATCH_POLL_INTERVAL_SECONDS):
+    """
+    Function: classify "General" articles by polling, for servers without change streams.
+    Args:
+      stop(threading.Event): set to stop polling
+      batch_size(int): most articles fetched and classified per query
+      poll_interval(float): seconds between queries once no articles are waiting
+    """
+    # Articles without content stay "General"; remember them so they are not fetched again
+    skipped = set()
+
+    while not stop.is_set():
+        query = {"category": "General"}
+        if skipped:
+            query["_id"] = {"$nin": list(skipped)}
+
+        found = 0
+        batch = []
+        for article in get_collection().find(query, {"content": 1}).limit(batch_size):
+            found += 1
+            if article.get("content"):
+                batch.append(article)
+            else:
+                skipped.add(article["_id"])
+
+        if batch:
+            update_categories(batch)
+        # A full page means more articles are probably waiting, so query again straight away
+        if found < batch_size:
+            stop.wait(poll_interval)
+
+def watch_articles(stop=None, batch_size=WATCH_BATCH_SIZE, max_wait=WATCH_MAX_WAIT_SECONDS,
+                   poll_interval=WATCH_POLL_INTERVAL_SECONDS):
+    """
+    Function: keep classifying newly inserted "General" articles until stop is set,
+    using a change stream when the server supports one and polling otherwise. A change
+    stream the server closes is reopened; other server errors are raised.
+    Args:
+      stop(threading.Event): set to stop the worker; runs forever when None
+      batch_size(int): most articles classified together
+      max_wait(float): seconds an article may wait for its change stream batch to fill
+      poll_interval(float): seconds between queries in polling mode
+    """
+    stop = stop or threading.Event()
+    collection = get_collection()
+    collection.create_index("category")
+    pipeline = [{"$match": {"operationType": "insert", "fullDocument.category": "General"}}]
+
+    while not stop.is_set():
+        try:
+            # Open the stream before catching up so articles inserted meanwhile are not missed
+            stream = collection.watch(pipeline, max_await_time_ms=int(max_wait * 500))
+        except OperationFailure as e:
+            # Standalone mongod (no replica set) does not support change streams
+            if e.code != CHANGE_STREAMS_UNSUPPORTED:
+                raise
+            print(f"⚠️ Change streams unavailable ({e}); polling every {poll_interval}s instead.")
+            poll_pending_articles(stop, batch_size, poll_interval)
+            return
+
+        with stream:
+            classify_pending_articles(batch_size, workers=1)
+            print("Watching for new articles...")
+            watch_change_stream(stream, stop, batch_size, max_wait)
+
+        # The server closed the stream (e.g. an invalidate event): reopen it and catch up
+        if not stop.is_set():
+            print("⚠️ Change stream closed; reopening it.")
+            stop.wait(max_wait)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the article category model or classify articles with it.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="Fit the model on the training CSV and save it")
+    train_parser.add_argument("--csv", default=TRAIN_CSV_PATH)
+    train_parser.add_argument("--model", default=MODEL_PATH)
+    train_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Preprocessing processes")
+    train_parser.add_argument("--cache-dir", default=PREPROCESS_CACHE_DIR, help="Preprocessed corpus cache ('' disables it)")
+    train_parser.add_argument("--features", choices=FEATURE_TYPES, default="tfidf", help="hashing allows incremental updates")
+
+    update_parser = subparsers.add_parser("update", help="Add labelled articles to a hashing-feature model without retraining")
+    update_parser.add_argument("--csv", required=True, help="CSV with Text and Category columns")
+    update_parser.add_argument("--model", default=MODEL_PATH)
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="Compare candidate classifiers on speed, size and macro-F1")
+    benchmark_parser.add_argument("--csv", default=TRAIN_CSV_PATH)
+    benchmark_parser.add_argument("--models", nargs="+", choices=list(BENCHMARK_MODELS), default=None)
+    benchmark_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Preprocessing processes")
+    benchmark_parser.add_argument("--cache-dir", default=PREPROCESS_CACHE_DIR, help="Preprocessed corpus cache ('' disables it)")
+    benchmark_parser.add_argument("--features", choices=FEATURE_TYPES, default="tfidf")
+    benchmark_parser.add_argument("--latency-samples", type=int, default=BENCHMARK_LATENCY_SAMPLES, help="Articles timed one at a time")
+    benchmark_parser.add_argument("--output", default="category_benchmark.json", help="Results file, .json or .csv")
+
+    classify_parser = subparsers.add_parser("classify", help="Classify \"General\" articles in MongoDB with a saved model")
+    classify_parser.add_argument("--model", default=MODEL_PATH)
+    classify_parser.add_argument("--batch-size", type=int, default=CLASSIFY_BATCH_SIZE)
+    classify_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Preprocessing processes")
+
+    watch_parser = subparsers.add_parser("watch", help="Keep classifying newly inserted \"General\" articles")
+    watch_parser.add_argument("--model", default=MODEL_PATH)
+    watch_parser.add_argument("--batch-size", type=int, default=WATCH_BATCH_SIZE)
+    watch_parser.add_argument("--max-wait", type=float, default=WATCH_MAX_WAIT_SECONDS, help="Seconds before a partial batch is classified")
+    watch_parser.add_argument("--poll-interval", type=float, default=WATCH_POLL_INTERVAL_SECONDS, help="Seconds between polls without change streams")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        results = train_model(args.csv, args.workers, args.cache_dir, args.features)
+        for cls_name, result in results.items():
+            print(f"{cls_name} trained in {result['train_time']:.2f}s")
+            print(result['classification_report'])
+        save_model(args.model)
+        print(f"Model saved to {args.model}")
+    elif args.command == "update":
+        load_model(args.model)
+        df = pd.read_csv(args.csv)
+        added = update_model(df['Text'].tolist(), df['Category'].tolist())
+        save_model(args.model)
+        print(f"Added {added} articles to {args.model}")
+    elif args.command == "benchmark":
+        rows = benchmark_models(args.csv, args.models, args.workers, args.cache_dir, args.features, args.latency_samples)
+        print(f"{'model':<28} {'train s':>8} {'p50 ms':>8} {'p99 ms':>8} {'art/s':>9} {'KB':>9} {'macro F1':>9}")
+        for row in rows:
+            print(f"{row['model']:<28} {row['train_time_s']:>8.2f} {row['latency_p50_ms']:>8.2f} {row['latency_p99_ms']:>8.2f} "
+                  f"{row['throughput_articles_per_s']:>9.0f} {row['model_size_kb']:>9.1f} {row['macro_f1']:>9.4f}")
+        write_benchmark(rows, args.output)
+        print(f"Results written to {args.output}")
+    elif args.command == "classify":
+        load_model(args.model)
+        classify_pending_articles(args.batch_size, args.workers)
+    elif args.command == "watch":
+        load_model(args.model)
+        try:
+            watch_articles(batch_size=args.batch_size, max_wait=args.max_wait, poll_interval=args.poll_interval)
+        except KeyboardInterrupt:
+            print("Stopped watching for new articles.")
+
+if __name__ == "__main__":
+    main()
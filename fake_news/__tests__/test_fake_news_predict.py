@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+import io
+import json
+import sys
+import os
+
+# Add the parent directory to the path so we can import the predict module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing predict loads the fine-tuned model, which these tests do not need
+with patch('transformers.AutoModelForSequenceClassification.from_pretrained'), patch('transformers.AutoTokenizer.from_pretrained'):
+    import predict
+from predict import handle_requests, serve
+
+def fake_scores(texts):
+    """Stands in for the model: a distinct score per text."""
+    return [{"fake": float(len(text)), "true": 100.0 - len(text)} for text in texts]
+
+class TestFakeNewsPredict(unittest.TestCase):
+
+    @patch('predict.predict_fake_news_batch', side_effect=fake_scores)
+    def test_handle_requests_scores_one_batch(self, mock_predict):
+        lines = [
+            json.dumps({"id": 1, "input_text": "first"}),
+            json.dumps({"id": "b", "input_text": "second text"}),
+        ]
+
+        responses = [json.loads(response) for response in handle_requests(lines)]
+
+        # Assertions
+        mock_predict.assert_called_once_with(["first", "second text"])
+        self.assertEqual(responses, [
+            {"id": 1, "fake": 5.0, "true": 95.0},
+            {"id": "b", "fake": 11.0, "true": 89.0},
+        ])
+
+    @patch('predict.predict_fake_news_batch', side_effect=fake_scores)
+    def test_handle_requests_rejects_malformed_requests(self, mock_predict):
+        lines = [
+            "not json",
+            json.dumps({"id": 1, "input_text": 123}),
+            json.dumps({"id": 2, "input_text": "   "}),
+            json.dumps({"id": 3}),
+            json.dumps(["input_text"]),
+            json.dumps({"id": 4, "input_text": "valid"}),
+        ]
+
+        responses = [json.loads(response) for response in handle_requests(lines)]
+
+        # Assertions
+        mock_predict.assert_called_once_with(["valid"])  # Bad requests never reach the model
+        self.assertEqual([response["id"] for response in responses], [None, 1, 2, 3, None, 4])
+        for response in responses[:5]:
+            self.assertTrue(response["error"].startswith("Invalid request"))
+        self.assertEqual(responses[5], {"id": 4, "fake": 5.0, "true": 95.0})
+
+    @patch('predict.predict_fake_news_batch', side_effect=RuntimeError("CUDA out of memory"))
+    def test_handle_requests_model_error(self, mock_predict):
+        lines = [json.dumps({"id": 1, "input_text": "first"}), "not json", json.dumps({"id": 2, "input_text": "second"})]
+
+        responses = [json.loads(response) for response in handle_requests(lines)]
+
+        # Assertions
+        self.assertEqual(responses[0], {"id": 1, "error": "CUDA out of memory"})
+        self.assertTrue(responses[1]["error"].startswith("Invalid request"))
+        self.assertEqual(responses[2], {"id": 2, "error": "CUDA out of memory"})
+
+    @patch('predict.predict_fake_news_batch', side_effect=fake_scores)
+    def test_serve(self, mock_predict):
+        stdin = io.StringIO(
+            json.dumps({"id": 1, "input_text": "first"}) + "\n"
+            "\n"
+            + json.dumps({"id": 2, "input_text": 123}) + "\n"
+            + json.dumps({"id": 3, "input_text": "third one"}) + "\n"
+        )
+        stdout = io.StringIO()
+
+        serve(stdin, stdout)
+
+        responses = {response["id"]: response for response in map(json.loads, stdout.getvalue().splitlines())}
+
+        # Assertions
+        self.assertEqual(sorted(responses), [1, 2, 3])  # One response per request, blank lines skipped
+        self.assertEqual(responses[1], {"id": 1, "fake": 5.0, "true": 95.0})
+        self.assertIn("error", responses[2])
+        self.assertEqual(responses[3], {"id": 3, "fake": 9.0, "true": 91.0})
+        scored = [text for call in mock_predict.call_args_list for text in call[0][0]]
+        self.assertEqual(sorted(scored), ["first", "third one"])
+
+if __name__ == '__main__':
+    unittest.main()
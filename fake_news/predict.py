@@ -1,29 +1,132 @@
+import os
 import sys
 import json
+import time
+import queue
+import threading
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import pandas as pd
 
 # Load the fine-tuned model
-MODEL_PATH = "./fine_tuned_fake_news_roberta"
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fine_tuned_fake_news_roberta")
 model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
 tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
 
+# Texts scored per forward pass; also the most queued requests the worker scores together
+MAX_BATCH_SIZE = 16
+# How long the worker waits for more requests to join a batch
+BATCH_WAIT_SECONDS = 0.01
+
+def predict_fake_news_batch(input_texts, batch_size=MAX_BATCH_SIZE, encodings=None):
+    """
+    Scores several texts, returning one probability dict per text in input order.
+    Texts are sorted by token length and batched in that order, so each batch only
+    pads up to its own longest text instead of to 512 tokens.
+    encodings can carry unpadded tokenizer output for the texts that was already
+    computed with an identical tokenizer.
+    """
+    input_texts = list(input_texts)
+    if not input_texts:
+        return []
+
+    if encodings is None:
+        encodings = tokenizer(input_texts, truncation=True, max_length=512)
+    order = sorted(range(len(encodings["input_ids"])), key=lambda i: len(encodings["input_ids"][i]))
+    results = [None] * len(order)
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        inputs = tokenizer.pad(
+            {key: [encodings[key][i] for i in bucket] for key in ("input_ids", "attention_mask")},
+            return_tensors="pt",
+        )
+
+        with torch.no_grad():
+            logits = model(**inputs).logits
+
+        probabilities = torch.nn.functional.softmax(logits, dim=-1).tolist()
+        for i, p in zip(bucket, probabilities):
+            results[i] = {"fake": round(p[0] * 100, 2), "true": round(p[1] * 100, 2)}
+
+    return results
+
 def predict_fake_news(input_text):
-    inputs = tokenizer(input_text, return_tensors="pt", truncation=True, max_length=512, padding="max_length")
-    
-    with torch.no_grad():
-        logits = model(**inputs).logits
-    
-    probabilities = torch.nn.functional.softmax(logits, dim=-1).tolist()[0]
-    response = {"fake": round(probabilities[0] * 100, 2), "true": round(probabilities[1] * 100, 2)}
-    
-    return response
+    return predict_fake_news_batch([input_text])[0]
+
+def handle_requests(lines):
+    """Scores a micro-batch of JSON request lines and returns one JSON response line per request."""
+    responses = [None] * len(lines)
+    pending = []
+
+    for i, line in enumerate(lines):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            input_text = request["input_text"]
+            # Reject bad input here, or it would fail every request batched with it
+            if not isinstance(input_text, str) or not input_text.strip():
+                raise ValueError("input_text must be a non-empty string")
+            pending.append((i, request_id, input_text))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            responses[i] = {"id": request_id, "error": f"Invalid request: {e}"}
+
+    if pending:
+        try:
+            results = predict_fake_news_batch([text for _, _, text in pending])
+            for (i, request_id, _), result in zip(pending, results):
+                responses[i] = {"id": request_id, **result}
+        except Exception as e:
+            for i, request_id, _ in pending:
+                responses[i] = {"id": request_id, "error": str(e)}
+
+    return [json.dumps(response) for response in responses]
+
+def serve(stdin=sys.stdin, stdout=sys.stdout):
+    """
+    Long-lived worker: keeps the model loaded and answers JSON lines
+    ({"id": ..., "input_text": ...}) on stdin with JSON lines on stdout.
+    Requests arriving within BATCH_WAIT_SECONDS of each other are scored together.
+    """
+    incoming = queue.Queue()
+
+    def read_requests():
+        for line in stdin:
+            if line.strip():
+                incoming.put(line)
+        incoming.put(None)
+
+    threading.Thread(target=read_requests, daemon=True).start()
+
+    running = True
+    while running:
+        line = incoming.get()
+        if line is None:
+            break
+
+        batch = [line]
+        deadline = time.monotonic() + BATCH_WAIT_SECONDS
+        while len(batch) < MAX_BATCH_SIZE:
+            try:
+                line = incoming.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if line is None:
+                running = False
+                break
+            batch.append(line)
+
+        for response in handle_requests(batch):
+            stdout.write(response + "\n")
+        stdout.flush()
 
 # Read input from Node.js
 if __name__ == "__main__":
-    input_data = json.loads(sys.argv[1])
-    input_text = input_data["input_text"]
-    result = predict_fake_news(input_text)
-    print(json.dumps(result))
-
+    if sys.argv[1:] == ["--serve"]:
+        serve()
+    else:
+        input_data = json.loads(sys.argv[1])
+        input_text = input_data["input_text"]
+        result = predict_fake_news(input_text)
+        print(json.dumps(result))
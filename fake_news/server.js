@@ -6,6 +6,76 @@ const app = express();
 app.use(express.json());
 app.use(cors());
 
+// predict.py runs as a long-lived worker so the model is only loaded once;
+// requests are matched to responses by id
+let worker = null;
+let nextRequestId = 0;
+const pending = new Map();
+
+// Fails every waiting request once a worker can no longer answer them
+function failWorker(shell, error) {
+    if (worker !== shell) {
+        return;
+    }
+    worker = null;
+    for (const request of pending.values()) {
+        request.reject(error);
+    }
+    pending.clear();
+}
+
+function startWorker() {
+    const shell = new PythonShell("predict.py", {
+        mode: "json",
+        pythonOptions: ["-u"],
+        scriptPath: new URL(".", import.meta.url).pathname.substring(3),
+        args: ["--serve"],
+    });
+
+    shell.on("message", message => {
+        const { id, ...result } = message;
+        const request = pending.get(id);
+        if (!request) {
+            console.error("Unmatched worker response:", message);
+            return;
+        }
+        pending.delete(id);
+        if (result.error) {
+            request.reject(new Error(result.error));
+        } else {
+            request.resolve(result);
+        }
+    });
+
+    shell.on("stderr", line => console.error("predict.py:", line));
+
+    // Emitted when predict.py cannot be started or prints a line that is not JSON;
+    // without a listener Node would crash the whole server
+    shell.on("error", err => {
+        console.error("predict.py worker error:", err);
+        failWorker(shell, err);
+        shell.kill();
+    });
+
+    shell.on("close", () => {
+        console.error("predict.py worker exited");
+        failWorker(shell, new Error("Worker exited"));
+    });
+
+    return shell;
+}
+
+function predictFakeNews(input_text) {
+    if (!worker) {
+        worker = startWorker();
+    }
+    const id = nextRequestId++;
+    return new Promise((resolve, reject) => {
+        pending.set(id, { resolve, reject });
+        worker.send({ id, input_text });
+    });
+}
+
 // Route to analyze fake news
 app.post("/analyse_fake_news", async (req, res) => {
     const { input_text } = req.body;
@@ -13,16 +83,8 @@ app.post("/analyse_fake_news", async (req, res) => {
         return res.status(400).json({ error: "Text input is required" });
     }
 
-    let options = {
-        mode: "text",
-        pythonOptions: ["-u"],
-        scriptPath: new URL(".", import.meta.url).pathname.substring(3),
-        args: [JSON.stringify({ input_text })],
-    };
-
-    PythonShell.run("predict.py", options).then(results => {
-        console.log("server.js: " + results[0]);
-        const response = JSON.parse(results[0]);
+    predictFakeNews(input_text).then(response => {
+        console.log("server.js: " + JSON.stringify(response));
         res.json(response);
     }).catch(err => {
         console.error("Error:", err);
@@ -33,4 +95,5 @@ app.post("/analyse_fake_news", async (req, res) => {
 const PORT = 4000;
 app.listen(PORT, () => {
     console.log(`Server running on http://127.0.0.1:${PORT}`);
-});
\ No newline at end of file
+    worker = startWorker();
+});
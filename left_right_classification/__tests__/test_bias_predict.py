@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import importlib.util
+
+# Add the parent directory to the path so we can import the predict module
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(MODULE_DIR)
+
+MODEL_DIR = os.path.join(MODULE_DIR, "fine_tuned_roberta")
+ONNX_MODEL = os.environ.get("BIAS_ONNX_MODEL", os.path.join(MODULE_DIR, "fine_tuned_roberta.onnx"))
+
+@unittest.skipUnless(
+    os.path.isdir(MODEL_DIR) and os.path.isfile(ONNX_MODEL) and importlib.util.find_spec("onnxruntime"),
+    "fine_tuned_roberta, its ONNX export and onnxruntime are required",
+)
+class TestBiasBackendParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import predict
+        cls.predict = predict
+
+        cls.texts = [
+            "Senate passes budget bill after late-night vote",
+            "The governor announced new funding for public schools and teachers. " * 10,
+            "Opinion: tax cuts will grow the economy",
+            "Protesters gathered outside city hall on Saturday demanding police reform. " * 40,
+        ]
+
+    def test_onnx_matches_torch(self):
+        """The ONNX Runtime backend returns the same percentages as the torch backend."""
+        torch_results = self.predict.predict_bias_batch(self.texts, backend="torch")
+        onnx_results = self.predict.predict_bias_batch(self.texts, backend="onnx")
+
+        for torch_result, onnx_result in zip(torch_results, onnx_results):
+            self.assertEqual(list(onnx_result), self.predict.bias_labels)
+            for label in self.predict.bias_labels:
+                self.assertAlmostEqual(torch_result[label], onnx_result[label], delta=0.05)
+
+    def test_unknown_backend(self):
+        """An unknown backend name is rejected."""
+        with self.assertRaises(ValueError):
+            self.predict.predict_bias("Some text", backend="tensorflow")
+
+if __name__ == '__main__':
+    unittest.main()
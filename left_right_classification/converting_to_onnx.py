@@ -1,28 +1,82 @@
+import argparse
+import numpy as np
 import onnx
 import onnxruntime as ort
-from transformers import AutoModelForSequenceClassification
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import torch
 
-# Load the fine-tuned model
-model = AutoModelForSequenceClassification.from_pretrained("fine_tuned_roberta", num_labels=5)
-model.eval()
-
-# Dummy input for ONNX conversion
-dummy_input = torch.ones(1, 512, dtype=torch.long)
-
-# Export the model
-onnx_model_path = "fine_tuned_roberta.onnx"
-torch.onnx.export(
-    model, 
-    dummy_input, 
-    onnx_model_path,
-    input_names=["input_ids"], 
-    output_names=["logits"], 
-    dynamic_axes={"input_ids": {0: "batch_size"}, "logits": {0: "batch_size"}},
-    opset_version=14  # Change this from 11 to 14 or higher
-)
-
-# Verify the model
-onnx_model = onnx.load(onnx_model_path)
-onnx.checker.check_model(onnx_model)
-print("ONNX model exported successfully!")
\ No newline at end of file
+# Sample articles used for the dummy export input and to validate the exported model
+SAMPLE_TEXTS = [
+    "Senate passes budget bill after late-night vote",
+    "The governor announced new funding for public schools and teachers on Monday, "
+    "saying the plan would reduce class sizes across the state.",
+    "Opinion: tax cuts will grow the economy",
+    "Protesters gathered outside city hall on Saturday demanding police reform. " * 60,
+]
+
+def export_onnx(model_path, onnx_model_path, num_labels):
+    """Exports the model with input_ids and attention_mask inputs and dynamic batch and sequence axes."""
+    # Load the fine-tuned model
+    model = AutoModelForSequenceClassification.from_pretrained(model_path, num_labels=num_labels)
+    model.eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+
+    # Dummy input for ONNX conversion
+    dummy_input = tokenizer(SAMPLE_TEXTS[:2], return_tensors="pt", padding=True)
+
+    # Export the model
+    torch.onnx.export(
+        model,
+        (dummy_input["input_ids"], dummy_input["attention_mask"]),
+        onnx_model_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch_size", 1: "sequence_length"},
+            "attention_mask": {0: "batch_size", 1: "sequence_length"},
+            "logits": {0: "batch_size"},
+        },
+        opset_version=14,  # Change this from 11 to 14 or higher
+        dynamo=False,
+    )
+
+def validate_onnx(model_path, onnx_model_path, texts=SAMPLE_TEXTS, atol=1e-4):
+    """
+    Checks the exported graph and compares its logits with the torch model, both on a padded
+    batch and on each text alone. Raises AssertionError on mismatch and returns the largest
+    absolute difference seen.
+    """
+    # Verify the model
+    onnx_model = onnx.load(onnx_model_path)
+    onnx.checker.check_model(onnx_model)
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    session = ort.InferenceSession(onnx_model_path, providers=["CPUExecutionProvider"])
+
+    max_diff = 0.0
+    batches = [texts] + [[text] for text in texts]
+    for batch in batches:
+        inputs = tokenizer(batch, return_tensors="np", truncation=True, max_length=512, padding=True)
+        feed = {"input_ids": inputs["input_ids"], "attention_mask": inputs["attention_mask"]}
+
+        with torch.no_grad():
+            expected = model(**{key: torch.from_numpy(value) for key, value in feed.items()}).logits.numpy()
+        actual = session.run(["logits"], feed)[0]
+
+        np.testing.assert_allclose(actual, expected, atol=atol, rtol=1e-3)
+        max_diff = max(max_diff, float(np.abs(actual - expected).max()))
+
+    return max_diff
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a fine-tuned RoBERTa classifier to ONNX.")
+    parser.add_argument("--model-path", default="fine_tuned_roberta")
+    parser.add_argument("--output", default="fine_tuned_roberta.onnx")
+    parser.add_argument("--num-labels", type=int, default=5)
+    args = parser.parse_args()
+
+    export_onnx(args.model_path, args.output, args.num_labels)
+    max_diff = validate_onnx(args.model_path, args.output)
+    print(f"ONNX model exported successfully! Max logit difference from torch: {max_diff:.2e}")
@@ -1,26 +1,110 @@
+import os
 import sys
 import json
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from functools import lru_cache
+import numpy as np
+from transformers import AutoTokenizer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Load the fine-tuned model
-MODEL_PATH = "./fine_tuned_roberta"
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+MODEL_PATH = os.path.join(BASE_DIR, "fine_tuned_roberta")
+ONNX_MODEL_PATH = os.environ.get("BIAS_ONNX_MODEL", os.path.join(BASE_DIR, "fine_tuned_roberta.onnx"))
 tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
 
+# Inference backend: "torch" or "onnx" (ONNX Runtime on CPU)
+BACKEND = os.environ.get("BIAS_BACKEND", "torch")
+ONNX_INTRA_OP_THREADS = int(os.environ.get("BIAS_ONNX_THREADS", os.cpu_count() or 1))
+
 # Define bias labels
 bias_labels = ["left", "lean left", "center", "lean right", "right"]
 
-def predict_bias(text):
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=512, padding="max_length")
-    
+# Texts scored per forward pass
+BATCH_SIZE = 16
+
+@lru_cache(maxsize=None)
+def get_torch_model():
+    # torch is only imported by the torch backend; the ONNX backend runs without it
+    from transformers import AutoModelForSequenceClassification
+
+    return AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+
+@lru_cache(maxsize=None)
+def get_onnx_session():
+    """Creates the ONNX Runtime session for the exported model (see converting_to_onnx.py)."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+    options.inter_op_num_threads = 1
+    return ort.InferenceSession(ONNX_MODEL_PATH, options, providers=["CPUExecutionProvider"])
+
+def onnx_sequence_length():
+    """Returns the sequence length the ONNX graph was exported with, or None if that axis is dynamic."""
+    length = get_onnx_session().get_inputs()[0].shape[1]
+    return length if isinstance(length, int) else None
+
+def torch_logits(inputs):
+    import torch
+
+    inputs = {key: torch.from_numpy(value) for key, value in inputs.items()}
     with torch.no_grad():
-        logits = model(**inputs).logits
-    
-    probabilities = torch.nn.functional.softmax(logits, dim=-1).tolist()[0]
-    response = {bias_labels[i]: round(probabilities[i] * 100, 2) for i in range(len(bias_labels))}
-    
-    return response
+        return get_torch_model()(**inputs).logits.numpy()
+
+def onnx_logits(inputs):
+    session = get_onnx_session()
+    feed = {graph_input.name: inputs[graph_input.name].astype(np.int64) for graph_input in session.get_inputs()}
+    return session.run(["logits"], feed)[0]
+
+def predict_bias_batch(texts, batch_size=BATCH_SIZE, backend=None, encodings=None):
+    """
+    Scores several texts, returning one bias percentage dict per text in input order.
+    Texts are sorted by token length and batched in that order, so each batch only
+    pads up to its own longest text instead of to 512 tokens.
+    encodings can carry unpadded tokenizer output for the texts that was already
+    computed with an identical tokenizer.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    backend = backend or BACKEND
+    if backend == "torch":
+        logits_fn, padding = torch_logits, {}
+    elif backend == "onnx":
+        logits_fn, padding = onnx_logits, {}
+        # Graphs exported with a fixed sequence length still need every batch padded to it
+        sequence_length = onnx_sequence_length()
+        if sequence_length:
+            padding = {"padding": "max_length", "max_length": sequence_length}
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    if encodings is None:
+        encodings = tokenizer(texts, truncation=True, max_length=512)
+    order = sorted(range(len(encodings["input_ids"])), key=lambda i: len(encodings["input_ids"][i]))
+    results = [None] * len(order)
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        inputs = tokenizer.pad(
+            {key: [encodings[key][i] for i in bucket] for key in ("input_ids", "attention_mask")},
+            return_tensors="np",
+            **padding,
+        )
+
+        logits = logits_fn(dict(inputs))
+        probabilities = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilities = (probabilities / probabilities.sum(axis=-1, keepdims=True)).tolist()
+        for i, p in zip(bucket, probabilities):
+            results[i] = {bias_labels[j]: round(p[j] * 100, 2) for j in range(len(bias_labels))}
+
+    return results
+
+def predict_bias(text, backend=None):
+    return predict_bias_batch([text], backend=backend)[0]
 
 # Read input from Node.js
 if __name__ == "__main__":
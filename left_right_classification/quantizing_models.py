@@ -0,0 +1,192 @@
+import argparse
+import io
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import onnxruntime as ort
+from onnxruntime.quantization import QuantType, quantize_dynamic
+import torch
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+from sklearn.model_selection import train_test_split
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from converting_to_onnx import export_onnx
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_bias_dataset(path):
+    """Same input text and labels as RoBERTa_model.py."""
+    df = pd.read_csv(path)
+    df.dropna(subset=["Text", "Title", "Source", "Bias"], inplace=True)
+    df["label"] = df["Bias"].map({"left": 0, "lean left": 1, "center": 2, "lean right": 3, "right": 4})
+    df["input_text"] = df["Title"] + " [SEP] " + df["Text"] + " [SEP] " + df["Source"]
+    return df
+
+def load_fake_news_dataset(path):
+    """Same input text and labels as fake_news/fake_model.py."""
+    df = pd.read_csv(path)
+    df = df[["title", "text", "label"]]
+    df.dropna(inplace=True)
+    df["input_text"] = df["title"] + " [SEP] " + df["text"]
+    return df
+
+MODELS = {
+    "bias": {
+        "model_path": os.path.join(BASE_DIR, "fine_tuned_roberta"),
+        "num_labels": 5,
+        "dataset": os.path.join(BASE_DIR, "datasets", "Political_Bias.csv"),
+        "load_dataset": load_bias_dataset,
+    },
+    "fake_news": {
+        "model_path": os.path.normpath(os.path.join(BASE_DIR, "..", "fake_news", "fine_tuned_fake_news_roberta")),
+        "num_labels": 2,
+        "dataset": os.path.normpath(os.path.join(BASE_DIR, "..", "fake_news", "Combined.csv")),
+        "load_dataset": load_fake_news_dataset,
+    },
+}
+
+def torch_predict(model, tokenizer, texts, batch_size=16):
+    predictions = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[start:start + batch_size], return_tensors="pt", truncation=True, max_length=512, padding=True)
+        with torch.no_grad():
+            predictions.extend(model(**inputs).logits.argmax(dim=-1).tolist())
+    return predictions
+
+def onnx_predict(session, tokenizer, texts, batch_size=16):
+    predictions = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[start:start + batch_size], return_tensors="np", truncation=True, max_length=512, padding=True)
+        feed = {"input_ids": inputs["input_ids"], "attention_mask": inputs["attention_mask"]}
+        predictions.extend(session.run(["logits"], feed)[0].argmax(axis=-1).tolist())
+    return predictions
+
+def median_latency_ms(predict, texts):
+    """Median wall time of scoring one text at a time, in milliseconds."""
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        predict([text])
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+def torch_size_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / 2**20
+
+def create_session(path):
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+def has_dynamic_inputs(onnx_path):
+    """
+    Whether an existing export takes input_ids and attention_mask with a dynamic sequence axis,
+    as onnx_predict() feeds them. Exports made before converting_to_onnx.py gained
+    attention_mask only take input_ids padded to 512 tokens.
+    """
+    inputs = create_session(onnx_path).get_inputs()
+    return ({graph_input.name for graph_input in inputs} == {"input_ids", "attention_mask"}
+            and not any(isinstance(graph_input.shape[1], int) for graph_input in inputs))
+
+def load_eval_sample(name, eval_size, eval_csv=None):
+    """
+    Returns (texts, labels, held_out) for the accuracy report: up to eval_size articles of
+    eval_csv, a file the model never trained on, or else a seeded sample of the training CSV.
+    RoBERTa_model.py and fake_model.py trained on unseeded 80% splits of that CSV, so most
+    of such a sample was seen in training and only the deltas between variants are meaningful.
+    """
+    config = MODELS[name]
+    df = config["load_dataset"](eval_csv or config["dataset"])
+    if len(df) > eval_size:
+        _, df = train_test_split(df, test_size=eval_size, random_state=42, stratify=df["label"])
+    return df["input_text"].tolist(), df["label"].tolist(), eval_csv is not None
+
+def quantize_model(name, eval_size, latency_samples, eval_csv=None):
+    """
+    Writes <model_path>.int8.onnx and returns accuracy, latency and size for the fp32 and
+    INT8 variants of the torch and ONNX models on the sample from load_eval_sample().
+    """
+    config = MODELS[name]
+    model_path = config["model_path"]
+    onnx_path = f"{model_path}.onnx"
+    int8_onnx_path = f"{model_path}.int8.onnx"
+
+    if not os.path.exists(onnx_path) or not has_dynamic_inputs(onnx_path):
+        print(f"Exporting {onnx_path} with attention_mask and a dynamic sequence axis")
+        export_onnx(model_path, onnx_path, config["num_labels"])
+    quantize_dynamic(onnx_path, int8_onnx_path, weight_type=QuantType.QInt8)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+    int8_model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    session = create_session(onnx_path)
+    int8_session = create_session(int8_onnx_path)
+
+    texts, labels, held_out = load_eval_sample(name, eval_size, eval_csv)
+
+    variants = {
+        "torch_fp32": (lambda batch: torch_predict(model, tokenizer, batch), torch_size_mb(model)),
+        "torch_int8": (lambda batch: torch_predict(int8_model, tokenizer, batch), torch_size_mb(int8_model)),
+        "onnx_fp32": (lambda batch: onnx_predict(session, tokenizer, batch), os.path.getsize(onnx_path) / 2**20),
+        "onnx_int8": (lambda batch: onnx_predict(int8_session, tokenizer, batch), os.path.getsize(int8_onnx_path) / 2**20),
+    }
+
+    report = {}
+    reference = None
+    for variant, (predict, size_mb) in variants.items():
+        predictions = predict(texts)
+        if reference is None:
+            reference = predictions
+        _, _, f1, _ = precision_recall_fscore_support(labels, predictions, average="macro", zero_division=0)
+        report[variant] = {
+            "accuracy": accuracy_score(labels, predictions),
+            "macro_f1": f1,
+            "agreement_with_torch_fp32": accuracy_score(reference, predictions),
+            "median_latency_ms": median_latency_ms(predict, texts[:latency_samples]),
+            "size_mb": size_mb,
+        }
+
+    baseline = report["torch_fp32"]
+    for variant in report.values():
+        variant["accuracy_delta"] = variant["accuracy"] - baseline["accuracy"]
+        variant["speedup"] = baseline["median_latency_ms"] / variant["median_latency_ms"]
+
+    return {
+        "eval_data": eval_csv or f"sample of the training CSV {config['dataset']}",
+        "held_out": held_out,
+        "eval_size": len(texts),
+        "variants": report,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Produce INT8 dynamically quantized variants of the RoBERTa classifiers.")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--eval-size", type=int, default=500, help="Articles used for the accuracy report")
+    parser.add_argument("--eval-csv", help="Held-out CSV, in the training CSV's format, for the accuracy report of a single model "
+                                           "(default: a sample of the training CSV, where only the deltas are meaningful)")
+    parser.add_argument("--latency-samples", type=int, default=50, help="Articles timed one at a time")
+    parser.add_argument("--report", default="quantization_report.json")
+    args = parser.parse_args()
+    if args.eval_csv and len(args.models) != 1:
+        parser.error("--eval-csv needs exactly one of --models")
+
+    reports = {name: quantize_model(name, args.eval_size, args.latency_samples, args.eval_csv) for name in args.models}
+
+    for name, result in reports.items():
+        report = result["variants"]
+        print(f"\n🔹 {name} ({result['eval_size']} articles, {result['eval_data']})")
+        if not result["held_out"]:
+            print("⚠️ Most of this sample was seen in training: absolute accuracy and macro F1 are inflated, only the deltas are meaningful")
+        print(f"{'variant':<12} {'accuracy':>9} {'delta':>8} {'macro F1':>9} {'agree':>7} {'p50 ms':>8} {'speedup':>8} {'MB':>8}")
+        for variant, row in report.items():
+            print(f"{variant:<12} {row['accuracy']:>9.4f} {row['accuracy_delta']:>+8.4f} {row['macro_f1']:>9.4f} "
+                  f"{row['agreement_with_torch_fp32']:>7.3f} {row['median_latency_ms']:>8.1f} {row['speedup']:>7.2f}x {row['size_mb']:>8.1f}")
+
+    with open(args.report, "w") as f:
+        json.dump(reports, f, indent=2)
+    print(f"\nReport written to {args.report}")
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 import sys
 import os
 import datetime
@@ -29,7 +29,7 @@ atexit.register(close_mongo_connection)
 
 class TestBBCScraper(unittest.TestCase):
     
-    @patch('bbc_scraper.requests.get')
+    @patch('bbc_scraper.session.get')
     def test_get_article_details_success(self, mock_get):
         # Mock the response
         mock_response = MagicMock()
@@ -67,7 +67,7 @@ class TestBBCScraper(unittest.TestCase):
         self.assertEqual(details["category"], "Politics")
         self.assertEqual(details["topics"], ["Tag1", "Tag2"])
         
-    @patch('bbc_scraper.requests.get')
+    @patch('bbc_scraper.session.get')
     def test_get_article_details_failure(self, mock_get):
         # Mock a failed response
         mock_response = MagicMock()
@@ -80,10 +80,10 @@ class TestBBCScraper(unittest.TestCase):
         # Assertions
         self.assertEqual(details, {})
         
-    @patch('bbc_scraper.requests.get')
+    @patch('bbc_scraper.session.get')
     @patch('bbc_scraper.get_article_details')
-    @patch('bbc_scraper.collection.find_one')
-    @patch('bbc_scraper.collection.insert_many')
+    @patch('bbc_scraper.collection.find')
+    @patch('scraping.upsert_documents')
     def test_scrape_articles_success(self, mock_insert, mock_find, mock_details, mock_get):
         # Mock the homepage response
         mock_homepage = MagicMock()
@@ -98,8 +98,8 @@ class TestBBCScraper(unittest.TestCase):
         """
         mock_get.return_value = mock_homepage
         
-        # Mock find_one to return None (no existing articles)
-        mock_find.return_value = None
+        # Mock find to return no existing articles
+        mock_find.return_value = []
         
         # Mock get_article_details to return sample details
         mock_details.return_value = {
@@ -115,11 +115,11 @@ class TestBBCScraper(unittest.TestCase):
         scrape_articles()
         
         # Assertions
-        self.assertEqual(mock_find.call_count, 2)  # Called for each article
+        self.assertEqual(mock_find.call_count, 1)  # One query for the whole homepage
         self.assertEqual(mock_details.call_count, 2)  # Called for each article
         mock_insert.assert_called_once()  # Articles were inserted
         
-    @patch('bbc_scraper.requests.get')
+    @patch('bbc_scraper.session.get')
     def test_scrape_articles_homepage_failure(self, mock_get):
         # Mock a failed homepage response
         mock_response = MagicMock()
@@ -132,8 +132,8 @@ class TestBBCScraper(unittest.TestCase):
         # Assertions
         self.assertEqual(result, None)
         
-    @patch('bbc_scraper.requests.get')
-    @patch('bbc_scraper.collection.find_one')
+    @patch('bbc_scraper.session.get')
+    @patch('bbc_scraper.collection.find')
     @patch('bbc_scraper.get_article_details')
     def test_scrape_articles_with_exception(self, mock_details, mock_find, mock_get):
         # Mock the homepage response
@@ -148,18 +148,52 @@ class TestBBCScraper(unittest.TestCase):
         """
         mock_get.return_value = mock_homepage
         
-        # Mock find_one to return None (no existing articles)
-        mock_find.return_value = None
+        # Mock find to return no existing articles
+        mock_find.return_value = []
         
         # Mock get_article_details to raise an exception
         mock_details.side_effect = Exception("Test exception")
         
-        # Call the function with patch for insert_many
-        with patch('bbc_scraper.collection.insert_many') as mock_insert:
+        # Call the function with patch for upsert_documents
+        with patch('scraping.upsert_documents') as mock_insert:
             scrape_articles()
             
             # Assertions
             mock_insert.assert_not_called()  # No articles were inserted due to exception
 
+    @patch('bbc_scraper.collection.find')
+    def test_scrape_articles_unchanged_homepage(self, mock_find):
+        # Mock an HTTP cache that has already seen the homepage
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = None
+        
+        # Call the function
+        scrape_articles(mock_cache)
+        
+        # Assertions
+        mock_cache.get.assert_called_once_with(ANY, "https://www.bbc.com/news", ANY)
+        mock_find.assert_not_called()  # Nothing was parsed
+        mock_cache.commit.assert_not_called()
+        
+    @patch('bbc_scraper.get_article_details')
+    @patch('bbc_scraper.collection.find')
+    @patch('scraping.upsert_documents')
+    def test_scrape_articles_commits_changed_homepage(self, mock_insert, mock_find, mock_details):
+        # Mock an HTTP cache returning a changed homepage
+        mock_homepage = MagicMock()
+        mock_homepage.status_code = 200
+        mock_homepage.text = '<html><body><a href="/news/article1"><h2>Article 1</h2></a></body></html>'
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = mock_homepage
+        mock_find.return_value = []
+        mock_details.return_value = {"content": "Test content"}
+        
+        # Call the function
+        scrape_articles(mock_cache)
+        
+        # Assertions
+        mock_insert.assert_called_once()
+        mock_cache.commit.assert_called_once_with("https://www.bbc.com/news")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extraction import has_class, make_details_extractor
+
+class TestExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.extract_details = make_details_extractor(
+            author=f"//*[{has_class('byline')}]",
+            category=f"//*[{has_class('section')}]",
+            topics=f"//*[{has_class('tags')}]//a",
+            default_author="Test News",
+        )
+
+    def test_extract_details(self):
+        page = """
+        <html>
+            <head>
+                <meta name="description" content="Test &amp; description">
+                <meta property="og:image" content="https://example.com/image.jpg">
+            </head>
+            <body>
+                <a class="section">Politics</a>
+                <article>
+                    <p> Test <b>paragraph</b> 1 </p>
+                    <section><p>Test paragraph 2</p></section>
+                </article>
+                <p>Not article text</p>
+                <div class="byline wide">John Doe</div>
+                <div class="byline">Jane Doe</div>
+                <div class="tags"><a>Tag1</a><a> Tag2 </a></div>
+            </body>
+        </html>
+        """
+
+        details = self.extract_details(page)
+
+        # Assertions
+        self.assertEqual(details, {
+            "description": "Test & description",
+            "content": "Test paragraph 1 Test paragraph 2",
+            "author": "John Doe",
+            "imageUrl": "https://example.com/image.jpg",
+            "category": "Politics",
+            "topics": ["Tag1", "Tag2"],
+        })
+
+    def test_extract_details_with_empty_page(self):
+        details = self.extract_details("")
+
+        # Assertions
+        self.assertEqual(details, {
+            "description": "No description available.",
+            "content": "",
+            "author": "Test News",
+            "imageUrl": "",
+            "category": "General",
+            "topics": ["General"],
+        })
+
+    def test_has_class_matches_whole_class_names(self):
+        details = self.extract_details('<div class="bylines">Not an author</div><a class="section-link">Not a section</a>')
+
+        # Assertions
+        self.assertEqual(details["author"], "Test News")
+        self.assertEqual(details["category"], "General")
+
+    def test_extract_details_with_xml_declaration(self):
+        page = '<?xml version="1.0" encoding="iso-8859-1"?><html><body><article><p>Caf\u00e9 \u20ac5</p></article><div class="byline">Jane Doe</div></body></html>'
+
+        details = self.extract_details(page)
+
+        # Assertions
+        self.assertEqual(details["content"], "Caf\u00e9 \u20ac5")
+        self.assertEqual(details["author"], "Jane Doe")
+
+if __name__ == '__main__':
+    unittest.main()
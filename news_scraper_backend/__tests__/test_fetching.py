@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+import threading
+import time
+import tempfile
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fetching import create_session, fetch_all, HttpCache, get_if_changed
+
+class TestFetching(unittest.TestCase):
+
+    def test_create_session(self):
+        session = create_session(pool_size=4)
+
+        # Assertions
+        self.assertEqual(session.headers["User-Agent"], "Mozilla/5.0")
+        adapter = session.get_adapter("https://www.bbc.com/news")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertFalse(adapter.max_retries.raise_on_status)
+
+    def test_fetch_all_keeps_input_order_and_reports_errors(self):
+        def fetch(url):
+            if url.endswith("bad"):
+                raise ValueError("bad page")
+            # Finish later pages first
+            time.sleep(0.01 * (3 - int(url[-1])))
+            return url.upper()
+
+        urls = ["https://a.com/1", "https://a.com/bad", "https://b.com/2"]
+        results = list(fetch_all(fetch, urls))
+
+        # Assertions
+        self.assertEqual([url for url, _, _ in results], urls)
+        self.assertEqual(results[0][1], "HTTPS://A.COM/1")
+        self.assertIsInstance(results[1][2], ValueError)
+        self.assertEqual(results[2][1], "HTTPS://B.COM/2")
+
+    def test_fetch_all_limits_requests_per_host(self):
+        lock = threading.Lock()
+        active = {"count": 0, "max": 0}
+
+        def fetch(url):
+            with lock:
+                active["count"] += 1
+                active["max"] = max(active["max"], active["count"])
+            time.sleep(0.02)
+            with lock:
+                active["count"] -= 1
+
+        urls = [f"https://www.bbc.com/news/{i}" for i in range(8)]
+        list(fetch_all(fetch, urls, max_workers=8, max_per_host=2))
+
+        # Assertions
+        self.assertEqual(active["max"], 2)
+
+    def test_fetch_all_with_no_urls(self):
+        self.assertEqual(list(fetch_all(lambda url: url, [])), [])
+
+    def make_response(self, status_code=200, content=b"<html></html>", headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = headers or {}
+        return response
+
+    def test_http_cache_sends_validators_after_commit(self):
+        url = "https://www.bbc.com/news"
+        session = MagicMock()
+        session.get.return_value = self.make_response(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir)
+            self.assertIsNotNone(cache.get(session, url))
+            session.get.assert_called_with(url, headers={}, timeout=(5, 15))
+
+            # Nothing is recorded until the page has been processed
+            self.assertIsNotNone(cache.get(session, url))
+            cache.commit(url)
+
+            session.get.return_value = self.make_response(status_code=304, content=b"")
+            response = HttpCache(cache_dir).get(session, url)
+
+        # Assertions
+        self.assertIsNone(response)
+        session.get.assert_called_with(url, headers={
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }, timeout=(5, 15))
+
+    def test_http_cache_skips_unchanged_body(self):
+        url = "https://www.youtube.com/feeds/videos.xml?channel_id=test"
+        session = MagicMock()
+        session.get.return_value = self.make_response(content=b"<feed>1</feed>")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = HttpCache(cache_dir)
+            cache.get(session, url)
+            cache.commit()
+
+            unchanged = cache.get(session, url)
+            session.get.return_value = self.make_response(content=b"<feed>2</feed>")
+            changed = cache.get(session, url)
+
+        # Assertions
+        self.assertIsNone(unchanged)
+        self.assertIsNotNone(changed)
+
+    def test_get_if_changed_without_cache(self):
+        session = MagicMock()
+        response = get_if_changed(session, "https://www.foxnews.com/")
+
+        # Assertions
+        self.assertEqual(response, session.get.return_value)
+        session.get.assert_called_once_with("https://www.foxnews.com/", timeout=(5, 15))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,7 @@ from fox_scraper import get_article_details, scrape_articles
 
 class TestFoxScraper(unittest.TestCase):
     
-    @patch('fox_scraper.requests.get')
+    @patch('fox_scraper.session.get')
     def test_get_article_details_success(self, mock_get):
         # Mock the response
         mock_response = MagicMock()
@@ -46,7 +46,7 @@ class TestFoxScraper(unittest.TestCase):
         self.assertEqual(details["category"], "Politics")
         self.assertEqual(details["topics"], ["Tag1", "Tag2"])
         
-    @patch('fox_scraper.requests.get')
+    @patch('fox_scraper.session.get')
     def test_get_article_details_failure(self, mock_get):
         # Mock a failed response
         mock_response = MagicMock()
@@ -59,10 +59,10 @@ class TestFoxScraper(unittest.TestCase):
         # Assertions
         self.assertEqual(details, {})
         
-    @patch('fox_scraper.requests.get')
+    @patch('fox_scraper.session.get')
     @patch('fox_scraper.get_article_details')
-    @patch('fox_scraper.collection.find_one')
-    @patch('fox_scraper.collection.insert_many')
+    @patch('fox_scraper.collection.find')
+    @patch('scraping.upsert_documents')
     def test_scrape_articles_success(self, mock_insert, mock_find, mock_details, mock_get):
         # Mock the homepage response
         mock_homepage = MagicMock()
@@ -77,8 +77,8 @@ class TestFoxScraper(unittest.TestCase):
         """
         mock_get.return_value = mock_homepage
         
-        # Mock find_one to return None (no existing articles)
-        mock_find.return_value = None
+        # Mock find to return no existing articles
+        mock_find.return_value = []
         
         # Mock get_article_details to return sample details
         mock_details.return_value = {
@@ -94,11 +94,11 @@ class TestFoxScraper(unittest.TestCase):
         scrape_articles()
         
         # Assertions
-        self.assertEqual(mock_find.call_count, 2)  # Called for each article
+        self.assertEqual(mock_find.call_count, 1)  # One query for the whole homepage
         self.assertEqual(mock_details.call_count, 2)  # Called for each article
         mock_insert.assert_called_once()  # Articles were inserted
         
-    @patch('fox_scraper.requests.get')
+    @patch('fox_scraper.session.get')
     def test_scrape_articles_homepage_failure(self, mock_get):
         # Mock a failed homepage response
         mock_response = MagicMock()
@@ -111,8 +111,8 @@ class TestFoxScraper(unittest.TestCase):
         # Assertions
         self.assertEqual(result, None)
         
-    @patch('fox_scraper.requests.get')
-    @patch('fox_scraper.collection.find_one')
+    @patch('fox_scraper.session.get')
+    @patch('fox_scraper.collection.find')
     @patch('fox_scraper.get_article_details')
     def test_scrape_articles_with_exception(self, mock_details, mock_find, mock_get):
         # Mock the homepage response
@@ -127,18 +127,52 @@ class TestFoxScraper(unittest.TestCase):
         """
         mock_get.return_value = mock_homepage
         
-        # Mock find_one to return None (no existing articles)
-        mock_find.return_value = None
+        # Mock find to return no existing articles
+        mock_find.return_value = []
         
         # Mock get_article_details to raise an exception
         mock_details.side_effect = Exception("Test exception")
         
-        # Call the function with patch for insert_many
-        with patch('fox_scraper.collection.insert_many') as mock_insert:
+        # Call the function with patch for upsert_documents
+        with patch('scraping.upsert_documents') as mock_insert:
             scrape_articles()
             
             # Assertions
             mock_insert.assert_not_called()  # No articles were inserted due to exception
 
+    @patch('fox_scraper.session.get')
+    @patch('fox_scraper.collection.find')
+    @patch('fox_scraper.get_article_details')
+    def test_scrape_articles_with_partial_failure(self, mock_details, mock_find, mock_get):
+        # Mock the homepage response
+        mock_homepage = MagicMock()
+        mock_homepage.status_code = 200
+        mock_homepage.text = """
+        <html>
+            <body>
+                <h2 class="title"><a href="/politics/article1">Article 1</a></h2>
+                <h2 class="title"><a href="/politics/article2">Article 2</a></h2>
+                <h2 class="title"><a href="/politics/article3">Article 3</a></h2>
+            </body>
+        </html>
+        """
+        mock_get.return_value = mock_homepage
+        mock_find.return_value = []
+        
+        # The second article page fails, the others succeed
+        def details(url):
+            if url.endswith("article2"):
+                raise Exception("Test exception")
+            return {"description": "Test description", "content": "Test content"}
+        mock_details.side_effect = details
+        
+        with patch('scraping.upsert_documents') as mock_insert:
+            scrape_articles()
+            
+            # Assertions
+            inserted = mock_insert.call_args[0][2]
+            self.assertEqual([article["url"] for article in inserted],
+                             ["https://www.foxnews.com/politics/article1", "https://www.foxnews.com/politics/article3"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
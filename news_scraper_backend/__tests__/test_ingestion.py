@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingestion import find_existing, select_new, ensure_unique_index, upsert_documents
+
+class TestIngestion(unittest.TestCase):
+
+    def test_find_existing_batches_queries(self):
+        collection = MagicMock()
+        collection.find.side_effect = [[{"url": "a"}], [{"url": "c"}]]
+
+        existing = find_existing(collection, "url", ["a", "b", "a", "c"], batch_size=2)
+
+        # Assertions
+        self.assertEqual(existing, {"a", "c"})
+        self.assertEqual(collection.find.call_count, 2)  # Repeated values are looked up once
+        collection.find.assert_any_call({"url": {"$in": ["a", "b"]}}, {"url": 1, "_id": 0})
+        collection.find.assert_any_call({"url": {"$in": ["c"]}}, {"url": 1, "_id": 0})
+
+    def test_select_new_skips_stored_and_repeated_items(self):
+        collection = MagicMock()
+        collection.find.return_value = [{"videoId": "stored"}]
+        videos = [{"videoId": "new1"}, {"videoId": "stored"}, {"videoId": "new2"}, {"videoId": "new1"}]
+
+        new_videos = select_new(collection, "videoId", videos, key=lambda video: video["videoId"])
+
+        # Assertions
+        self.assertEqual(new_videos, [{"videoId": "new1"}, {"videoId": "new2"}])
+
+    def test_select_new_with_no_items(self):
+        collection = MagicMock()
+
+        # Assertions
+        self.assertEqual(select_new(collection, "url", [], key=lambda item: item), [])
+        collection.find.assert_not_called()
+
+    def test_ensure_unique_index(self):
+        collection = MagicMock()
+        ensure_unique_index(collection, "url")
+
+        # Assertions
+        collection.create_index.assert_called_once_with([("url", 1)], unique=True, name="url_unique")
+
+    def test_ensure_unique_index_with_existing_duplicates(self):
+        collection = MagicMock()
+        collection.create_index.side_effect = OperationFailure("E11000 duplicate key error", code=11000)
+
+        # Assertions
+        ensure_unique_index(collection, "url")  # Reported, not raised
+
+    def test_upsert_documents(self):
+        collection = MagicMock()
+        collection.bulk_write.return_value.upserted_count = 2
+        documents = [{"_id": "1", "url": "a"}, {"_id": "2", "url": "b"}]
+
+        inserted = upsert_documents(collection, "url", documents)
+
+        # Assertions
+        self.assertEqual(inserted, 2)
+        collection.bulk_write.assert_called_once_with([
+            UpdateOne({"url": "a"}, {"$setOnInsert": {"_id": "1", "url": "a"}}, upsert=True),
+            UpdateOne({"url": "b"}, {"$setOnInsert": {"_id": "2", "url": "b"}}, upsert=True),
+        ], ordered=False)
+
+    def test_upsert_documents_with_concurrent_duplicate(self):
+        collection = MagicMock()
+        collection.bulk_write.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key error"}],
+            "nUpserted": 1,
+        })
+
+        inserted = upsert_documents(collection, "url", [{"url": "a"}, {"url": "b"}])
+
+        # Assertions
+        self.assertEqual(inserted, 1)
+
+    def test_upsert_documents_with_other_write_error(self):
+        collection = MagicMock()
+        collection.bulk_write.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 0, "code": 121, "errmsg": "Document failed validation"}],
+            "nUpserted": 0,
+        })
+
+        # Assertions
+        with self.assertRaises(BulkWriteError):
+            upsert_documents(collection, "url", [{"url": "a"}])
+
+if __name__ == '__main__':
+    unittest.main()
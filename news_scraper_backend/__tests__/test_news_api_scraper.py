@@ -24,10 +24,10 @@ atexit.register(close_mongo_connection)
 
 class TestNewsApiScraper(unittest.TestCase):
     
-    @patch('news_api_scraper.collection.find_one')
-    @patch('news_api_scraper.collection.insert_many')
+    @patch('news_api_scraper.collection.find')
+    @patch('news_api_scraper.upsert_documents')
     @patch('uuid.uuid4')
-    def test_save_articles_new(self, mock_uuid, mock_insert, mock_find_one):
+    def test_save_articles_new(self, mock_uuid, mock_insert, mock_find):
         # Mock UUID to return predictable values
         mock_uuid.side_effect = [
             uuid.UUID('12345678-1234-5678-1234-567812345678'),
@@ -36,8 +36,8 @@ class TestNewsApiScraper(unittest.TestCase):
             uuid.UUID('99999999-8888-7777-6666-555555555555')
         ]
         
-        # Mock find_one to return None (no existing articles)
-        mock_find_one.return_value = None
+        # Mock find to return no existing articles
+        mock_find.return_value = []
         
         # Sample articles
         articles = [
@@ -67,12 +67,16 @@ class TestNewsApiScraper(unittest.TestCase):
         save_articles(articles)
         
         # Assertions
-        self.assertEqual(mock_find_one.call_count, 2)  # Called for each article
+        mock_find.assert_called_once_with(
+            {"url": {"$in": ["https://www.bbc.com/news/test1", "https://www.foxnews.com/news/test2"]}},
+            {"url": 1, "_id": 0},
+        )  # One query for the whole batch
         mock_insert.assert_called_once()  # Articles were inserted
         
-        # Check the arguments passed to insert_many
+        # Check the arguments passed to upsert_documents
         args, _ = mock_insert.call_args
-        inserted_articles = args[0]
+        self.assertEqual(args[1], "url")
+        inserted_articles = args[2]
         self.assertEqual(len(inserted_articles), 2)
         
         # Check the first article
@@ -85,11 +89,14 @@ class TestNewsApiScraper(unittest.TestCase):
         self.assertEqual(inserted_articles[1]["description"], "Test Description 2")
         self.assertEqual(inserted_articles[1]["source"], "Fox News")
         
-    @patch('news_api_scraper.collection.find_one')
-    @patch('news_api_scraper.collection.insert_many')
-    def test_save_articles_existing(self, mock_insert, mock_find_one):
-        # Mock find_one to return True (articles already exist)
-        mock_find_one.return_value = True
+    @patch('news_api_scraper.collection.find')
+    @patch('news_api_scraper.upsert_documents')
+    def test_save_articles_existing(self, mock_insert, mock_find):
+        # Mock find to return both articles (articles already exist)
+        mock_find.return_value = [
+            {"url": "https://www.bbc.com/news/test1"},
+            {"url": "https://www.foxnews.com/news/test2"},
+        ]
         
         # Sample articles
         articles = [
@@ -109,21 +116,21 @@ class TestNewsApiScraper(unittest.TestCase):
         save_articles(articles)
         
         # Assertions
-        self.assertEqual(mock_find_one.call_count, 2)  # Called for each article
+        self.assertEqual(mock_find.call_count, 1)  # One query for the whole batch
         mock_insert.assert_not_called()  # No articles were inserted
         
-    @patch('news_api_scraper.collection.find_one')
-    @patch('news_api_scraper.collection.insert_many')
+    @patch('news_api_scraper.collection.find')
+    @patch('news_api_scraper.upsert_documents')
     @patch('uuid.uuid4')
-    def test_save_articles_mixed(self, mock_uuid, mock_insert, mock_find_one):
+    def test_save_articles_mixed(self, mock_uuid, mock_insert, mock_find):
         # Mock UUID to return predictable values
         mock_uuid.side_effect = [
             uuid.UUID('12345678-1234-5678-1234-567812345678'),
             uuid.UUID('87654321-4321-8765-4321-876543210987')
         ]
         
-        # Mock find_one to return True for the first article and None for the second
-        mock_find_one.side_effect = [True, None]
+        # Mock find to return the first article only
+        mock_find.return_value = [{"url": "https://www.bbc.com/news/test1"}]
         
         # Sample articles
         articles = [
@@ -153,23 +160,24 @@ class TestNewsApiScraper(unittest.TestCase):
         save_articles(articles)
         
         # Assertions
-        self.assertEqual(mock_find_one.call_count, 2)  # Called for each article
+        self.assertEqual(mock_find.call_count, 1)  # One query for the whole batch
         mock_insert.assert_called_once()  # Articles were inserted
         
-        # Check the arguments passed to insert_many
+        # Check the arguments passed to upsert_documents
         args, _ = mock_insert.call_args
-        inserted_articles = args[0]
+        self.assertEqual(args[1], "url")
+        inserted_articles = args[2]
         self.assertEqual(len(inserted_articles), 1)
         self.assertEqual(inserted_articles[0]["title"], "Test Article 2")
         
-    @patch('news_api_scraper.collection.find_one')
-    def test_save_articles_empty(self, mock_find_one):
+    @patch('news_api_scraper.collection.find')
+    def test_save_articles_empty(self, mock_find):
         # Call the function with an empty list
-        with patch('news_api_scraper.collection.insert_many') as mock_insert:
+        with patch('news_api_scraper.upsert_documents') as mock_insert:
             save_articles([])
             
             # Assertions
-            mock_find_one.assert_not_called()  # Not called for empty list
+            mock_find.assert_not_called()  # Not called for empty list
             mock_insert.assert_not_called()  # No articles were inserted
     
     @patch('news_api_scraper.requests.get')
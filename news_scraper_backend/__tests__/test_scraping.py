@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping import SITES, find_headlines, scrape_site
+
+class TestScraping(unittest.TestCase):
+
+    def test_find_headlines_bbc(self):
+        page = """
+        <html>
+            <body>
+                <a href="/news/article1"><div><h2> Article 1 </h2></div></a>
+                <a href="https://www.bbc.com/news/article2"><h2>Article 2</h2></a>
+                <h2>Not a link</h2>
+            </body>
+        </html>
+        """
+
+        # Assertions
+        self.assertEqual(find_headlines("bbc", page), [
+            ("Article 1", "https://www.bbc.com/news/article1"),
+            ("Article 2", "https://www.bbc.com/news/article2"),
+        ])
+
+    def test_find_headlines_fox(self):
+        page = """
+        <html>
+            <body>
+                <h2 class="title title-color-default"><a href="/politics/article1">Article 1</a></h2>
+                <h2 class="subtitle"><a href="/politics/article2">Not a headline</a></h2>
+            </body>
+        </html>
+        """
+
+        # Assertions
+        self.assertEqual(find_headlines("fox", page), [("Article 1", "https://www.foxnews.com/politics/article1")])
+
+    def test_find_headlines_with_xml_declaration(self):
+        page = '<?xml version="1.0" encoding="utf-8"?><html><body><a href="/news/article1"><h2>Article 1</h2></a></body></html>'
+
+        # Assertions
+        self.assertEqual(find_headlines("bbc", page), [("Article 1", "https://www.bbc.com/news/article1")])
+
+    @patch('scraping.upsert_documents')
+    def test_scrape_site_from_config_entry(self, mock_upsert):
+        # A new source is only a registry entry
+        site = {
+            "source": "Example News",
+            "homepage": "https://news.example.com/",
+            "headlines": "//li[@class='story']/a",
+            "link": "@href",
+            "author": "//*[@rel='author']",
+            "category": "//*[@class='kicker']",
+            "topics": "//*[@class='topic']",
+        }
+        session = MagicMock()
+        session.get.return_value.status_code = 200
+        session.get.return_value.text = """
+        <ul>
+            <li class="story"><a href="/story1">Story 1</a></li>
+            <li class="story"><a href="/story2">Story 2</a></li>
+        </ul>
+        """
+        collection = MagicMock()
+        collection.find.return_value = [{"url": "https://news.example.com/story1"}]
+        get_details = MagicMock(return_value={"content": "Story content", "author": "Ann Author"})
+
+        with patch.dict(SITES, {"example": site}):
+            scrape_site("example", session, collection, get_details)
+
+        # Assertions
+        get_details.assert_called_once_with("https://news.example.com/story2")  # Only the new story is fetched
+        self.assertEqual(mock_upsert.call_args[0][1], "url")
+        articles = mock_upsert.call_args[0][2]
+        self.assertEqual(len(articles), 1)
+        self.assertEqual(articles[0]["title"], "Story 2")
+        self.assertEqual(articles[0]["source"], "Example News")
+        self.assertEqual(articles[0]["author"], "Ann Author")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,10 +4,14 @@ import sys
 import os
 import xml.etree.ElementTree as ET
 import atexit
+import json
+import tempfile
 
 # Add the parent directory to the path so we can import the modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from video_scraper import parse_duration, get_channel_videos, scrape_videos
+from fetching import HttpCache
+import video_scraper
+from video_scraper import parse_duration, get_channel_videos, scrape_videos, load_channels, load_watermarks
 
 # MongoDB connection cleanup
 from pymongo import MongoClient
@@ -48,7 +52,7 @@ class TestVideoScraper(unittest.TestCase):
         result = parse_duration(duration)
         self.assertEqual(result, "00:00")
         
-    @patch('video_scraper.requests.get')
+    @patch('video_scraper.session.get')
     def test_get_channel_videos_success(self, mock_get):
         # Create a sample RSS feed response
         rss_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -82,7 +86,7 @@ class TestVideoScraper(unittest.TestCase):
         self.assertEqual(videos[0]["thumbnailUrl"], "https://example.com/thumbnail.jpg")
         self.assertEqual(videos[0]["publishedAt"], "2023-01-01T12:00:00Z")
         
-    @patch('video_scraper.requests.get')
+    @patch('video_scraper.session.get')
     def test_get_channel_videos_failure(self, mock_get):
         # Mock a failed response
         mock_get.side_effect = Exception("Connection error")
@@ -94,8 +98,8 @@ class TestVideoScraper(unittest.TestCase):
         self.assertEqual(videos, [])
         
     @patch('video_scraper.get_channel_videos')
-    @patch('video_scraper.video_collection.find_one')
-    @patch('video_scraper.video_collection.insert_many')
+    @patch('video_scraper.video_collection.find')
+    @patch('video_scraper.upsert_documents')
     def test_scrape_videos_success(self, mock_insert, mock_find, mock_get_videos):
         # Mock get_channel_videos to return sample videos
         mock_get_videos.return_value = [
@@ -115,19 +119,23 @@ class TestVideoScraper(unittest.TestCase):
             }
         ]
         
-        # Mock find_one to return None (new videos) for all calls
-        mock_find.return_value = None
+        # Mock find to return no existing videos
+        mock_find.return_value = []
         
         # Call the function
         scrape_videos()
         
         # Assertions
         self.assertEqual(mock_get_videos.call_count, 4)  # Called for each channel
-        self.assertTrue(mock_find.call_count >= 2)  # Called for each video
+        self.assertEqual(mock_find.call_count, 1)  # One query for every channel
         mock_insert.assert_called_once()  # New videos were inserted
         
+        # Videos repeated across channels are only inserted once
+        inserted_videos = mock_insert.call_args[0][2]
+        self.assertEqual([video["videoId"] for video in inserted_videos], ["video123", "video456"])
+        
     @patch('video_scraper.get_channel_videos')
-    @patch('video_scraper.video_collection.find_one')
+    @patch('video_scraper.video_collection.find')
     def test_scrape_videos_no_new_videos(self, mock_find, mock_get_videos):
         # Mock get_channel_videos to return sample videos
         mock_get_videos.return_value = [
@@ -137,18 +145,18 @@ class TestVideoScraper(unittest.TestCase):
             }
         ]
         
-        # Mock find_one to return True (video already exists)
-        mock_find.return_value = True
+        # Mock find to return the video (video already exists)
+        mock_find.return_value = [{"videoId": "video123"}]
         
-        # Call the function with patch for insert_many
-        with patch('video_scraper.video_collection.insert_many') as mock_insert:
+        # Call the function with patch for upsert_documents
+        with patch('video_scraper.upsert_documents') as mock_insert:
             scrape_videos()
             
             # Assertions
             mock_insert.assert_not_called()  # No new videos to insert
             
     @patch('video_scraper.get_channel_videos')
-    @patch('video_scraper.video_collection.find_one')
+    @patch('video_scraper.video_collection.find')
     def test_scrape_videos_insert_error(self, mock_find, mock_get_videos):
         # Mock get_channel_videos to return sample videos
         mock_get_videos.return_value = [
@@ -158,12 +166,12 @@ class TestVideoScraper(unittest.TestCase):
             }
         ]
         
-        # Mock find_one to return None (new video)
-        mock_find.return_value = None
+        # Mock find to return no existing videos (new video)
+        mock_find.return_value = []
         
-        # Call the function with patch for insert_many
-        with patch('video_scraper.video_collection.insert_many') as mock_insert:
-            # Mock insert_many to raise an exception
+        # Call the function with patch for upsert_documents
+        with patch('video_scraper.upsert_documents') as mock_insert:
+            # Mock upsert_documents to raise an exception
             mock_insert.side_effect = Exception("Database error")
             
             # Call the function
@@ -172,5 +180,172 @@ class TestVideoScraper(unittest.TestCase):
             # Assertions
             mock_insert.assert_called_once()  # Insert was attempted
 
+    @patch('video_scraper.session.get')
+    def test_get_channel_videos_multiple_entries(self, mock_get):
+        # Create a feed with channel metadata before its entries
+        entries = "".join(f"""
+            <entry>
+                <yt:videoId>video{i}</yt:videoId>
+                <title>Test Video {i}</title>
+                <media:group>
+                    <media:description></media:description>
+                    <media:thumbnail url="https://example.com/thumbnail{i}.jpg"/>
+                </media:group>
+                <published>2023-01-0{i}T12:00:00Z</published>
+            </entry>""" for i in range(1, 4))
+        rss_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+        <feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+            <title>Test Channel</title>
+            <yt:channelId>test_channel_id</yt:channelId>{entries}
+        </feed>
+        """
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = rss_content.encode('utf-8')
+        mock_get.return_value = mock_response
+        
+        # Call the function
+        videos = get_channel_videos("test_channel_id")
+        
+        # Assertions
+        self.assertEqual([video["videoId"] for video in videos], ["video1", "video2", "video3"])
+        self.assertEqual(videos[2]["title"], "Test Video 3")
+        self.assertEqual(videos[0]["description"], "No description available")
+        
+    def test_load_channels(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "channels.json")
+            with open(path, "w") as f:
+                json.dump({"channel1": "Source 1", "channel2": "Source 2"}, f)
+            
+            channels = load_channels(path)
+        
+        # Assertions
+        self.assertEqual(channels, {"channel1": "Source 1", "channel2": "Source 2"})
+        self.assertEqual(len(load_channels()), 4)  # The bundled channel list
+        
+    @patch('video_scraper.get_channel_videos')
+    @patch('video_scraper.video_collection.find')
+    @patch('video_scraper.upsert_documents')
+    def test_scrape_videos_with_channel_list(self, mock_insert, mock_find, mock_get_videos):
+        # Return one video per channel, named after the channel
+        mock_get_videos.side_effect = lambda channel_id, http_cache, watermark: [{"videoId": f"{channel_id}-video"}]
+        mock_find.return_value = []
+        
+        # Call the function
+        scrape_videos(news_channels={f"channel{i}": f"Source {i}" for i in range(20)})
+        
+        # Assertions
+        self.assertEqual(mock_get_videos.call_count, 20)
+        inserted_videos = mock_insert.call_args[0][2]
+        self.assertEqual([video["videoId"] for video in inserted_videos], [f"channel{i}-video" for i in range(20)])
+        self.assertEqual([video["source"] for video in inserted_videos], [f"Source {i}" for i in range(20)])
+
+    def make_feed_response(self, video_ids):
+        # Feeds list videos newest first
+        entries = "".join(f"""
+            <entry>
+                <yt:videoId>{video_id}</yt:videoId>
+                <title>Title {video_id}</title>
+                <media:group>
+                    <media:description>Description</media:description>
+                    <media:thumbnail url="https://example.com/{video_id}.jpg"/>
+                </media:group>
+                <published>2023-01-{day:02d}T12:00:00+00:00</published>
+            </entry>""" for video_id, day in video_ids)
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = f"""<?xml version="1.0" encoding="UTF-8"?>
+        <feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">{entries}
+        </feed>""".encode('utf-8')
+        return mock_response
+        
+    @patch('video_scraper.session.get')
+    def test_get_channel_videos_stops_at_watermark(self, mock_get):
+        mock_get.return_value = self.make_feed_response([("new2", 5), ("new1", 4), ("seen", 3), ("old", 2)])
+        
+        # Call the function
+        videos = get_channel_videos("test_channel_id", watermark={"videoId": "seen", "published": "2023-01-03T12:00:00+00:00"})
+        
+        # Assertions
+        self.assertEqual([video["videoId"] for video in videos], ["new2", "new1"])
+        
+    @patch('video_scraper.session.get')
+    def test_get_channel_videos_stops_at_older_entries(self, mock_get):
+        # The watermark video was removed from the feed
+        mock_get.return_value = self.make_feed_response([("new1", 4), ("old", 2)])
+        
+        # Call the function
+        videos = get_channel_videos("test_channel_id", watermark={"videoId": "deleted", "published": "2023-01-03T12:00:00+00:00"})
+        
+        # Assertions
+        self.assertEqual([video["videoId"] for video in videos], ["new1"])
+        
+    def test_load_watermarks(self):
+        mock_watermarks = MagicMock()
+        mock_watermarks.find.return_value = [{"_id": "channel1", "videoId": "video1", "published": "2023-01-01T12:00:00+00:00"}]
+        
+        watermarks = load_watermarks(mock_watermarks, ["channel1", "channel2"])
+        
+        # Assertions
+        mock_watermarks.find.assert_called_once_with({"_id": {"$in": ["channel1", "channel2"]}})
+        self.assertEqual(watermarks["channel1"]["videoId"], "video1")
+        self.assertNotIn("channel2", watermarks)
+        
+    @patch('video_scraper.session.get')
+    @patch('video_scraper.video_collection.find')
+    @patch('video_scraper.upsert_documents')
+    def test_scrape_videos_advances_watermarks(self, mock_insert, mock_find, mock_get):
+        mock_get.return_value = self.make_feed_response([("new1", 4), ("seen", 3)])
+        mock_find.return_value = []
+        mock_watermarks = MagicMock()
+        mock_watermarks.find.return_value = [{"_id": "channel1", "videoId": "seen", "published": "2023-01-03T12:00:00+00:00"}]
+        
+        # Call the function
+        scrape_videos(news_channels={"channel1": "Source 1"}, watermarks=mock_watermarks)
+        
+        # Assertions
+        self.assertEqual([video["videoId"] for video in mock_insert.call_args[0][2]], ["new1"])
+        operations = mock_watermarks.bulk_write.call_args[0][0]
+        self.assertEqual(len(operations), 1)
+        self.assertEqual(operations[0]._filter, {"_id": "channel1"})
+        self.assertEqual(operations[0]._doc["$set"]["videoId"], "new1")
+        self.assertEqual(operations[0]._doc["$set"]["published"], "2023-01-04T12:00:00+00:00")
+        
+    @patch('video_scraper.get_channel_videos')
+    @patch('video_scraper.video_collection.find')
+    @patch('video_scraper.upsert_documents')
+    def test_scrape_videos_keeps_watermarks_when_insert_fails(self, mock_insert, mock_find, mock_get_videos):
+        mock_get_videos.return_value = [{"videoId": "new1", "publishedAt": "2023-01-04T12:00:00+00:00"}]
+        mock_find.return_value = []
+        mock_insert.side_effect = Exception("Database error")
+        mock_watermarks = MagicMock()
+        mock_watermarks.find.return_value = []
+        
+        # Call the function
+        scrape_videos(news_channels={"channel1": "Source 1"}, watermarks=mock_watermarks)
+        
+        # Assertions
+        mock_watermarks.bulk_write.assert_not_called()
+        
+    @patch('video_scraper.session.get')
+    @patch('video_scraper.video_collection.find')
+    @patch('video_scraper.upsert_documents')
+    def test_scrape_videos_refetches_malformed_feed(self, mock_insert, mock_find, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {"ETag": '"v1"'}
+        mock_get.return_value.content = b"<feed><entry>broken"
+        mock_find.return_value = []
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            scrape_videos(HttpCache(cache_dir), {"channel1": "Source 1"})
+            
+            # The truncated feed was not recorded, so it is fetched in full next time
+            response = HttpCache(cache_dir).get(video_scraper.session, "https://www.youtube.com/feeds/videos.xml?channel_id=channel1")
+        
+        # Assertions
+        self.assertIsNotNone(response)
+        self.assertNotIn("If-None-Match", mock_get.call_args[1]["headers"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
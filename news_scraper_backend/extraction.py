@@ -0,0 +1,54 @@
+from lxml import etree, html
+
+# Selectors shared by every site, compiled once
+DESCRIPTION = etree.XPath("//meta[@name='description']/@content")
+IMAGE_URL = etree.XPath("//meta[@property='og:image']/@content")
+PARAGRAPHS = etree.XPath("//article//p")
+
+# Parses text already decoded by requests once it is re-encoded, ignoring the page's own declaration
+UTF8_PARSER = html.HTMLParser(encoding="utf-8")
+
+def has_class(name):
+    """XPath predicate equivalent to the CSS class selector .name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def parse_html(page):
+    """Parses a page with lxml's HTML parser; an empty page yields an empty document."""
+    try:
+        return html.fromstring(page)
+    except ValueError:
+        # lxml refuses str input that starts with an <?xml ... encoding=...?> declaration
+        return html.fromstring(page.encode("utf-8"), parser=UTF8_PARSER)
+    except etree.ParserError:
+        return html.fromstring("<html></html>")
+
+def make_details_extractor(author, category, topics, default_author):
+    """
+    Returns a function turning an article page into the description, content, author,
+    imageUrl, category and topics dict, given XPath expressions for the author and category
+    elements (the first match is used) and the topic links.
+    """
+    author = etree.XPath(author)
+    category = etree.XPath(category)
+    topics = etree.XPath(topics)
+
+    def first_text(elements, default):
+        return elements[0].text_content().strip() if elements else default
+
+    def extract_details(page):
+        tree = parse_html(page)
+
+        descriptions = DESCRIPTION(tree)
+        image_urls = IMAGE_URL(tree)
+        category_name = first_text(category(tree), "General")
+
+        return {
+            "description": descriptions[0] if descriptions else "No description available.",
+            "content": " ".join([p.text_content().strip() for p in PARAGRAPHS(tree)]),
+            "author": first_text(author(tree), default_author),
+            "imageUrl": image_urls[0] if image_urls else "",
+            "category": category_name,
+            "topics": [tag.text_content().strip() for tag in topics(tree)] or [category_name],
+        }
+
+    return extract_details
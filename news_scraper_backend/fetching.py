@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0"
+
+# (connect, read) timeouts in seconds for every scraper request
+REQUEST_TIMEOUT = (5, 15)
+
+# Article pages fetched at once, and at most MAX_PER_HOST of them from the same host
+MAX_WORKERS = 16
+MAX_PER_HOST = 8
+
+# Transient failures (connection errors, rate limiting, 5xx) are retried with exponential
+# backoff of RETRY_BACKOFF_SECONDS * 2^n, honouring Retry-After
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Validators and body hashes of the homepages and feeds last processed, one file per URL
+HTTP_CACHE_DIR = ".http_cache"
+
+def create_session(pool_size=MAX_WORKERS, retries=MAX_RETRIES):
+    """
+    Creates a keep-alive session whose connection pool fits pool_size concurrent requests per
+    host and which retries transient failures. Once retries run out the last response is
+    returned, so callers still see its status code.
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    retry = Retry(
+        total=retries,
+        backoff_factor=RETRY_BACKOFF_SECONDS,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class HostLimiter:
+    """Hands out one semaphore per host so no host sees more than limit concurrent requests."""
+
+    def __init__(self, limit=MAX_PER_HOST):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.semaphores = {}
+
+    def __call__(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self.semaphores[host]
+
+class HttpCache:
+    """
+    On-disk record of the ETag, Last-Modified and body hash last processed for each URL.
+    get() sends a conditional request and returns None when the page has not changed. Call
+    commit() once a changed page has been processed, so a failed run retries it next time.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.pending = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def load(self, url):
+        try:
+            with open(self.entry_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, session, url, timeout=REQUEST_TIMEOUT):
+        """Fetches url unless the server answers 304 or returns the same body as last time, in which case None is returned."""
+        entry = self.load(url)
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return None
+        if response.status_code != 200:
+            return response
+
+        body_sha256 = hashlib.sha256(response.content).hexdigest()
+        if body_sha256 == entry.get("body_sha256"):
+            return None
+
+        with self.lock:
+            self.pending[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body_sha256": body_sha256,
+            }
+        return response
+
+    def discard(self, url):
+        """Forgets a page fetched by get() that could not be processed, so it is fetched again next time."""
+        with self.lock:
+            self.pending.pop(url, None)
+
+    def commit(self, url=None):
+        """Records the pages fetched by get() as processed: url alone, or every pending one."""
+        with self.lock:
+            urls = [url] if url is not None else list(self.pending)
+            entries = {url: self.pending.pop(url) for url in urls if url in self.pending}
+
+        for url, entry in entries.items():
+            path = self.entry_path(url)
+            with open(path + ".tmp", "w") as f:
+                json.dump(entry, f)
+            os.replace(path + ".tmp", path)
+
+def get_if_changed(session, url, cache=None, timeout=REQUEST_TIMEOUT):
+    """session.get(url) through cache when one is given; None means the page is unchanged."""
+    if cache is None:
+        return session.get(url, timeout=timeout)
+    return cache.get(session, url, timeout)
+
+def fetch_all(fetch, urls, max_workers=MAX_WORKERS, max_per_host=MAX_PER_HOST):
+    """
+    Calls fetch(url) for every url on a thread pool and yields (url, result, error) in input
+    order, with error set to the exception fetch raised. Requests that have not started are
+    cancelled if the caller stops iterating early.
+    """
+    if not urls:
+        return
+
+    limiter = HostLimiter(max_per_host)
+
+    def limited_fetch(url):
+        with limiter(url):
+            return fetch(url)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    try:
+        futures = [executor.submit(limited_fetch, url) for url in urls]
+        for url, future in zip(urls, futures):
+            try:
+                yield url, future.result(), None
+            except Exception as e:
+                yield url, None, e
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,61 @@
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+# Keys looked up per {"$in": [...]} query
+DEDUP_BATCH_SIZE = 1000
+
+# MongoDB error code of a unique index violation
+DUPLICATE_KEY_ERROR = 11000
+
+def find_existing(collection, field, values, batch_size=DEDUP_BATCH_SIZE):
+    """Returns the set of values already stored in the collection's field, with one $in query per batch_size values."""
+    values = list(dict.fromkeys(values))
+    existing = set()
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        for document in collection.find({field: {"$in": batch}}, {field: 1, "_id": 0}):
+            existing.add(document[field])
+    return existing
+
+def select_new(collection, field, items, key):
+    """
+    Returns the items whose key(item) is neither stored in the collection's field nor repeated
+    earlier in items, keeping their order.
+    """
+    keys = [key(item) for item in items]
+    seen = find_existing(collection, field, keys)
+
+    new_items = []
+    for item, value in zip(items, keys):
+        if value not in seen:
+            seen.add(value)
+            new_items.append(item)
+    return new_items
+
+def ensure_unique_index(collection, field):
+    """
+    Creates the unique index on field that makes dedup lookups and upserts O(log n). Existing
+    duplicates prevent the index from being built; they are reported and scraping carries on.
+    """
+    try:
+        collection.create_index([(field, ASCENDING)], unique=True, name=f"{field}_unique")
+    except OperationFailure as e:
+        print(f"⚠️ Could not create a unique index on {collection.name}.{field}: {e}")
+
+def upsert_documents(collection, field, documents):
+    """
+    Inserts the documents whose field value is not stored yet, in one unordered bulk_write of
+    upserts keyed on field, and returns how many were inserted. Documents that already exist,
+    e.g. inserted by a concurrent scraper, are left untouched.
+    """
+    if not documents:
+        return 0
+
+    operations = [UpdateOne({field: document[field]}, {"$setOnInsert": document}, upsert=True) for document in documents]
+    try:
+        return collection.bulk_write(operations, ordered=False).upserted_count
+    except BulkWriteError as e:
+        # Two upserts racing on the unique index: the loser's document is already stored
+        if any(error["code"] != DUPLICATE_KEY_ERROR for error in e.details["writeErrors"]):
+            raise
+        return e.details["nUpserted"]
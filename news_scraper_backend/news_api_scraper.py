@@ -2,6 +2,7 @@ import requests
 import datetime
 import uuid
 from pymongo import MongoClient
+from ingestion import ensure_unique_index, select_new, upsert_documents
 
 # 🔹 MongoDB Connection
 MONGO_URI = "mongodb://localhost:27017/"
@@ -34,12 +35,11 @@ def save_articles(articles):
     """Save new articles to MongoDB, avoiding duplicates."""
     new_articles = []
     
+    # 🔹 Skip articles that already exist, with one query for the whole batch
+    articles = select_new(collection, "url", articles, key=lambda article: article["url"])
+
     for article in articles:
         url = article["url"]
-        
-        # 🔹 Skip if the article already exists
-        if collection.find_one({"url": url}):
-            continue
 
         new_article = {
             "_id": str(uuid.uuid4()),
@@ -61,11 +61,12 @@ def save_articles(articles):
         new_articles.append(new_article)
 
     if new_articles:
-        collection.insert_many(new_articles, ordered=False)
-        print(f"✅ {len(new_articles)} New Articles Stored in MongoDB")
+        inserted = upsert_documents(collection, "url", new_articles)
+        print(f"✅ {inserted} New Articles Stored in MongoDB")
     else:
         print("⚠️ No new articles found.")
 
 if __name__ == "__main__":
+    ensure_unique_index(collection, "url")
     articles = fetch_news()
     save_articles(articles)
@@ -0,0 +1,156 @@
+import argparse
+import datetime
+import uuid
+from functools import lru_cache
+from urllib.parse import urljoin
+import requests
+from lxml import etree
+from pymongo import MongoClient
+from fetching import REQUEST_TIMEOUT, HttpCache, create_session, fetch_all, get_if_changed
+from ingestion import ensure_unique_index, select_new, upsert_documents
+from extraction import has_class, make_details_extractor, parse_html
+
+# Every news site the engine can scrape. A site is its homepage, an XPath selecting the
+# headline elements there, an XPath from a headline to its article link, and XPaths for the
+# author, category and topic elements of an article page. Adding a source is one entry here.
+SITES = {
+    "bbc": {
+        "source": "BBC News",
+        "homepage": "https://www.bbc.com/news",
+        "headlines": "//a//h2",
+        "link": "ancestor::a[1]/@href",
+        "author": f"//*[{has_class('ssrcss-68pt20-Contributor')}]",
+        "category": f"//*[{has_class('ssrcss-1sbyv9-SectionLink')}]",
+        "topics": f"//*[{has_class('ssrcss-1ynkz29-TagList')}]//a",
+    },
+    "fox": {
+        "source": "Fox News",
+        "homepage": "https://www.foxnews.com/",
+        "headlines": f"//h2[{has_class('title')}]//a",
+        "link": "@href",
+        "author": f"//*[{has_class('author-byline')}]",
+        "category": f"//*[{has_class('eyebrow')}]",
+        "topics": f"//*[{has_class('tag')}]",
+    },
+}
+
+MONGO_URI = "mongodb://localhost:27017"
+
+@lru_cache(maxsize=None)
+def get_extractor(name):
+    """Compiles a site's selectors once: (headlines, link, extract_details)."""
+    site = SITES[name]
+    return (
+        etree.XPath(site["headlines"]),
+        etree.XPath(site["link"]),
+        make_details_extractor(site["author"], site["category"], site["topics"], default_author=site["source"]),
+    )
+
+def find_headlines(name, page):
+    """Returns (title, absolute article URL) for every headline on a site's homepage."""
+    headlines, link, _ = get_extractor(name)
+    homepage = SITES[name]["homepage"]
+
+    candidates = []
+    for headline in headlines(parse_html(page)):
+        hrefs = link(headline)
+        if hrefs:
+            candidates.append((headline.text_content().strip(), urljoin(homepage, hrefs[0])))
+    return candidates
+
+def fetch_article_details(name, session, article_url):
+    """Fetch additional details from one of a site's article pages."""
+    response = session.get(article_url, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        return {}
+
+    _, _, extract_details = get_extractor(name)
+    return extract_details(response.text)
+
+def make_article(name, title, url, details):
+    """Builds the articles collection document for a scraped article."""
+    source = SITES[name]["source"]
+    return {
+        "_id": str(uuid.uuid4()),
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "description": details.get("description", "No description available"),
+        "content": details.get("content", "No content available"),
+        "author": details.get("author", source),
+        "source": source,
+        "url": url,
+        "imageUrl": details.get("imageUrl", "No image"),
+        "publishedAt": datetime.datetime.utcnow(),
+        "category": details.get("category", "General"),
+        "topics": details.get("topics", []),
+        "likes": 0,
+        "comments": []
+    }
+
+def scrape_site(name, session, collection, get_details, http_cache=None):
+    """
+    Scrapes a site's homepage, fetches the new articles with get_details(url) concurrently and
+    stores them in the collection. A page that fails is skipped, not the whole run. The run is
+    skipped if http_cache has already seen the homepage.
+    """
+    source = SITES[name]["source"]
+    url = SITES[name]["homepage"]
+    try:
+        response = get_if_changed(session, url, http_cache)
+    except requests.RequestException as e:
+        print(f"⚠️ Failed to fetch {source} homepage: {e}")
+        return
+    if response is None:
+        print(f"✅ {source} homepage unchanged since the last scrape.")
+        return
+    if response.status_code != 200:
+        print(f"⚠️ Failed to fetch {source} homepage.")
+        return
+
+    candidates = find_headlines(name, response.text)
+    for _, full_url in candidates:
+        print(full_url)
+
+    # Skip articles already in the database with one query for the whole homepage
+    candidates = select_new(collection, "url", candidates, key=lambda candidate: candidate[1])
+
+    # Fetch the article pages concurrently; results come back in homepage order
+    articles = []
+    failed = 0
+    fetched = fetch_all(get_details, [full_url for _, full_url in candidates])
+    for (title, full_url), (_, details, error) in zip(candidates, fetched):
+        if error is not None:
+            failed += 1
+            print(f"⚠️ Failed to fetch {full_url}: {error}")
+            continue
+
+        articles.append(make_article(name, title, full_url, details))
+
+    if failed:
+        print(f"⚠️ {failed} of {len(candidates)} article pages could not be fetched")
+
+    if articles:
+        inserted = upsert_documents(collection, "url", articles)
+        print(f"✅ {inserted} New {source} Articles Stored in MongoDB")
+    else:
+        print(f"⚠️ No new {source} articles found.")
+
+    # Only skip this homepage next time if every article on it was stored
+    if http_cache is not None and not failed:
+        http_cache.commit(url)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape news sites into the articles collection.")
+    parser.add_argument("sites", nargs="*", default=list(SITES), help=f"Sites to scrape (default: all of {', '.join(SITES)})")
+    args = parser.parse_args()
+    unknown = [name for name in args.sites if name not in SITES]
+    if unknown:
+        parser.error(f"unknown sites {', '.join(unknown)}; choose from {', '.join(SITES)}")
+
+    collection = MongoClient(MONGO_URI)["news_db"]["articles"]
+    ensure_unique_index(collection, "url")
+    session = create_session()
+    http_cache = HttpCache()
+
+    for name in args.sites:
+        scrape_site(name, session, collection, lambda url, name=name: fetch_article_details(name, session, url), http_cache)
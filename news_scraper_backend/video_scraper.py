@@ -1,9 +1,13 @@
-from pymongo import MongoClient
-import requests
-from bs4 import BeautifulSoup
+from pymongo import MongoClient, UpdateOne
+import argparse
 import datetime
+import io
+import json
+import os
 import uuid
 import xml.etree.ElementTree as ET
+from ingestion import ensure_unique_index, select_new, upsert_documents
+from fetching import HttpCache, create_session, fetch_all, get_if_changed
 
 # MongoDB Connection
 MONGO_URI = "mongodb://localhost:27017"
@@ -11,6 +15,23 @@ client = MongoClient(MONGO_URI)
 db = client["news_db"]
 video_collection = db["videos"]
 
+# Newest video stored per channel ({"_id": channel_id, "videoId", "published"}); feeds list
+# videos newest first, so parsing stops at the watermark and only newer entries are built
+watermark_collection = db["channel_watermarks"]
+
+# Channels to monitor, a JSON object mapping YouTube channel IDs to source names
+CHANNELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "news_channels.json")
+
+# Channel feeds fetched at once over one keep-alive session
+FEED_WORKERS = 16
+session = create_session(pool_size=FEED_WORKERS)
+
+# Namespaces of the YouTube RSS feed
+NS = {'yt': 'http://www.youtube.com/xml/schemas/2015',
+      'media': 'http://search.yahoo.com/mrss/',
+      'atom': 'http://www.w3.org/2005/Atom'}
+ENTRY_TAG = f"{{{NS['atom']}}}entry"
+
 def parse_duration(duration_str):
     """Convert ISO 8601 duration to readable format."""
     try:
@@ -24,30 +45,68 @@ def parse_duration(duration_str):
     except:
         return "00:00"
 
-def get_channel_videos(channel_id):
-    """Fetch videos from a YouTube channel's RSS feed."""
+def load_channels(path=CHANNELS_PATH):
+    """Load the {channel_id: source} mapping of channels to monitor."""
+    with open(path) as f:
+        return json.load(f)
+
+def iter_feed_entries(content):
+    """Stream the <entry> elements of a feed, freeing each one once it has been handled."""
+    for _, element in ET.iterparse(io.BytesIO(content)):
+        if element.tag == ENTRY_TAG:
+            yield element
+            element.clear()
+
+def parse_published(published):
+    """Parse a feed timestamp such as 2023-01-01T12:00:00+00:00."""
+    return datetime.datetime.fromisoformat(published.replace("Z", "+00:00"))
+
+def is_seen(video_id, published, watermark):
+    """Whether a feed entry is the watermark video or older than it."""
+    if watermark is None:
+        return False
+    return video_id == watermark["videoId"] or parse_published(published) < parse_published(watermark["published"])
+
+def load_watermarks(collection, channel_ids):
+    """Load the watermarks of the channels with one query: {channel_id: watermark}."""
+    return {watermark["_id"]: watermark for watermark in collection.find({"_id": {"$in": list(channel_ids)}})}
+
+def save_watermarks(collection, newest_videos):
+    """Advance each channel's watermark to its newest fetched video, given {channel_id: video}."""
+    if not newest_videos:
+        return
+    
+    now = datetime.datetime.utcnow()
+    collection.bulk_write([
+        UpdateOne({"_id": channel_id}, {"$set": {"videoId": video["videoId"], "published": video["publishedAt"], "updatedAt": now}}, upsert=True)
+        for channel_id, video in newest_videos.items()
+    ], ordered=False)
+
+def get_channel_videos(channel_id, http_cache=None, watermark=None):
+    """
+    Fetch videos from a YouTube channel's RSS feed; none if http_cache has seen the feed.
+    With a watermark, parsing stops at the first entry that is not newer than it.
+    """
     feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
     
     try:
-        response = requests.get(feed_url)
+        response = get_if_changed(session, feed_url, http_cache)
+        if response is None:
+            return []
         response.raise_for_status()
         
-        # Parse XML feed
-        root = ET.fromstring(response.content)
-        
-        # Define namespace
-        ns = {'yt': 'http://www.youtube.com/xml/schemas/2015',
-              'media': 'http://search.yahoo.com/mrss/',
-              'atom': 'http://www.w3.org/2005/Atom'}
-        
         videos = []
         
-        for entry in root.findall('atom:entry', ns):
-            video_id = entry.find('yt:videoId', ns).text
-            title = entry.find('atom:title', ns).text
-            description = entry.find('media:group/media:description', ns).text
-            published = entry.find('atom:published', ns).text
-            thumbnail = entry.find('media:group/media:thumbnail', ns).get('url')
+        # Parse XML feed
+        for entry in iter_feed_entries(response.content):
+            video_id = entry.find('yt:videoId', NS).text
+            published = entry.find('atom:published', NS).text
+            if is_seen(video_id, published, watermark):
+                break
+            
+            title = entry.find('atom:title', NS).text
+            description = entry.find('media:group/media:description', NS).text
+            thumbnail = entry.find('media:group/media:thumbnail', NS).get('url')
             
             video = {
                 "_id": str(uuid.uuid4()),
@@ -75,38 +134,66 @@ def get_channel_videos(channel_id):
     
     except Exception as e:
         print(f"Error fetching channel videos: {e}")
+        # Do not record a feed that failed to parse as processed
+        if http_cache is not None:
+            http_cache.discard(feed_url)
         return []
 
-def scrape_videos():
-    """Fetch and store news videos."""
-    # List of news channel IDs
-    news_channels = {
-        "UCXIJgqnII2ZOINSWNOGFThA": "BBC News",  # BBC News
-        "UCBi2mrWuNuyYy4gbM6fU18Q": "ABC News",  # ABC News
-        "UCeY0bbntWzzVIaj2z3QigXg": "NBC News",  # NBC News
-        "UCupvZG-5ko_eiXAupbDfxWw": "CNN",       # CNN
-    }
+def scrape_videos(http_cache=None, news_channels=None, watermarks=None):
+    """
+    Fetch and store news videos, skipping feeds http_cache has already seen and, given a
+    watermarks collection, feed entries no newer than each channel's watermark.
+    """
+    # Mapping of news channel IDs to source names
+    if news_channels is None:
+        news_channels = load_channels()
     
     all_videos = []
+    newest_videos = {}
+    channel_ids = list(news_channels)
+    channel_watermarks = load_watermarks(watermarks, channel_ids) if watermarks is not None else {}
     
-    for channel_id, source in news_channels.items():
-        print(f"Fetching videos from {source}...")
-        videos = get_channel_videos(channel_id)
+    # Fetch every channel feed concurrently; get_channel_videos reports its own errors
+    print(f"Fetching videos from {len(news_channels)} channels...")
+    fetched = fetch_all(lambda channel_id: get_channel_videos(channel_id, http_cache, channel_watermarks.get(channel_id)),
+                        channel_ids, max_workers=FEED_WORKERS, max_per_host=FEED_WORKERS)
+    
+    for channel_id, videos, error in fetched:
+        if error is not None:
+            print(f"Error fetching channel videos: {error}")
+            continue
         
+        source = news_channels[channel_id]
         for video in videos:
-            # Check if video already exists
-            if not video_collection.find_one({"videoId": video["videoId"]}):
-                video["source"] = source
-                all_videos.append(video)
+            video["source"] = source
+            all_videos.append(video)
+        
+        if watermarks is not None and videos:
+            newest_videos[channel_id] = max(videos, key=lambda video: parse_published(video["publishedAt"]))
+    
+    # Keep only videos not already stored, with one query for every channel
+    all_videos = select_new(video_collection, "videoId", all_videos, key=lambda video: video["videoId"])
     
     if all_videos:
         try:
-            video_collection.insert_many(all_videos, ordered=False)
-            print(f"✅ {len(all_videos)} New Videos Stored in MongoDB")
+            inserted = upsert_documents(video_collection, "videoId", all_videos)
+            print(f"✅ {inserted} New Videos Stored in MongoDB")
         except Exception as e:
             print(f"Error storing videos in MongoDB: {e}")
+            return
     else:
         print("⚠️ No new videos found.")
+    
+    # The feeds are stored, so skip them next time unless they change
+    if watermarks is not None:
+        save_watermarks(watermarks, newest_videos)
+    if http_cache is not None:
+        http_cache.commit()
 
 if __name__ == "__main__":
-    scrape_videos()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch new videos from YouTube news channels.")
+    parser.add_argument("--channels", default=CHANNELS_PATH, help="JSON file mapping channel IDs to source names")
+    args = parser.parse_args()
+    
+    ensure_unique_index(video_collection, "videoId")
+    scrape_videos(HttpCache(), load_channels(args.channels), watermark_collection)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import unittest
+import io
+import json
+import sys
+import os
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the predict module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import predict
+from predict import split_sentences, analyze_sentiment_vader, analyze_sentiment_batch, analyze_sentiment_sentences, analyze, serve
+
+SCHEMA = {"sentiment", "score", "positive", "neutral", "negative"}
+
+class FlushCountingStream(io.StringIO):
+    """Records the output written at each flush() call."""
+
+    def __init__(self):
+        super().__init__()
+        self.flushed = []
+
+    def flush(self):
+        super().flush()
+        self.flushed.append(self.getvalue())
+
+class TestSentimentPredict(unittest.TestCase):
+
+    def tearDown(self):
+        if predict.sentence_pool is not None:
+            predict.sentence_pool.shutdown()
+            predict.sentence_pool = None
+            predict.sentence_workers = 1
+
+    def test_split_sentences(self):
+        text = "  The vote passed. Was it fair?  Critics said no!\nSupporters cheered.  Officials agreed "
+
+        # Assertions
+        self.assertEqual(split_sentences(text), [
+            "The vote passed.",
+            "Was it fair?",
+            "Critics said no!",
+            "Supporters cheered.",
+            "Officials agreed",
+        ])
+        self.assertEqual(split_sentences("3.5 percent growth"), ["3.5 percent growth"])  # No whitespace after the period
+        self.assertEqual(split_sentences("   "), [])
+
+    def test_analyze_sentiment_batch_matches_single_texts(self):
+        texts = ["Great news for everyone.", "A terrible, tragic loss.", "The meeting is on Monday."]
+
+        # Assertions
+        self.assertEqual(analyze_sentiment_batch(texts), [analyze_sentiment_vader(text) for text in texts])
+        self.assertEqual([result["sentiment"] for result in analyze_sentiment_batch(texts)], ["Positive", "Negative", "Neutral"])
+
+    def test_analyze_sentiment_sentences(self):
+        text = "This is a wonderful, happy day. The war was a horrible disaster."
+
+        result = analyze_sentiment_sentences(text)
+
+        # Assertions
+        self.assertEqual(set(result), SCHEMA | {"sentences"})
+        self.assertEqual([sentence["text"] for sentence in result["sentences"]], split_sentences(text))
+        for sentence in result["sentences"]:
+            self.assertEqual(set(sentence), SCHEMA | {"text"})
+            self.assertEqual(sentence, {"text": sentence["text"], **analyze_sentiment_vader(sentence["text"])})
+
+        # Overall scores are averages weighted by sentence word count (6 and 6 words here)
+        positive, negative = result["sentences"]
+        self.assertAlmostEqual(result["score"], round((positive["score"] + negative["score"]) / 2, 4))
+        self.assertAlmostEqual(result["negative"], (positive["negative"] + negative["negative"]) / 2)
+        self.assertEqual(result["sentiment"], predict.sentiment_label(result["score"]))
+
+    def test_analyze_sentiment_sentences_without_sentences(self):
+        result = analyze_sentiment_sentences("   ")
+
+        # Assertions
+        self.assertEqual(result, {**analyze_sentiment_vader("   "), "sentences": []})
+
+    def test_analyze_sentiment_sentences_is_serial_by_default(self):
+        text = " ".join(["The recovery is going well."] * predict.MIN_PARALLEL_SENTENCES)
+
+        analyze_sentiment_sentences(text)
+
+        # Assertions
+        self.assertIsNone(predict.sentence_pool)  # One-shot calls never start worker processes
+
+    def test_analyze_sentiment_sentences_pool_matches_single_process(self):
+        sentences = ["The recovery is going well.", "Floods destroyed several homes.", "Officials met on Tuesday."]
+        text = " ".join(sentences * 4)
+        serial = analyze_sentiment_sentences(text)
+
+        pool = predict.start_sentence_pool(2)
+        with patch('predict.MIN_PARALLEL_SENTENCES', 10), patch.object(pool, 'map', wraps=pool.map) as mock_map:
+            parallel = analyze_sentiment_sentences(text)
+
+        # Assertions
+        mock_map.assert_called_once()
+        self.assertEqual(parallel, serial)
+        self.assertIs(predict.start_sentence_pool(2), pool)  # The warm pool is reused
+
+    def test_analyze_dispatch(self):
+        text = "Great result. Awful weather."
+
+        # Assertions
+        self.assertEqual(analyze({"input_text": text}), analyze_sentiment_vader(text))
+        self.assertEqual(analyze({"input_text": text, "mode": "sentences"}), analyze_sentiment_sentences(text))
+        self.assertEqual(analyze({"input_text": ""}), {"error": "No input text provided"})
+        self.assertEqual(analyze({}), {"error": "No input text provided"})
+
+    def test_serve(self):
+        stdin = io.StringIO(
+            '{"id": 1, "input_text": "Great news."}\n'
+            '\n'
+            '{"id": 2, "input_text": "Bad news. Good news.", "mode": "sentences"}\n'
+            'not json\n'
+        )
+        stdout = FlushCountingStream()
+
+        serve(stdin, stdout)
+
+        results = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        # Assertions
+        self.assertEqual(results[0], {"id": 1, **analyze_sentiment_vader("Great news.")})
+        self.assertEqual(results[1], {"id": 2, **analyze_sentiment_sentences("Bad news. Good news.")})
+        self.assertEqual(results[2]["id"], None)
+        self.assertTrue(results[2]["error"].startswith("Invalid request"))
+
+        # Every result line is flushed as soon as it is written
+        self.assertEqual(len(stdout.flushed), 3)
+        self.assertEqual([len(output.splitlines()) for output in stdout.flushed], [1, 2, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,32 +1,134 @@
+import re
 import sys
 import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
+# Loading the VADER lexicon and emoji tables is the expensive part, so do it once per process
+analyzer = SentimentIntensityAnalyzer()
+
+# Sentence mode: articles are split after sentence-ending punctuation. Scoring a sentence
+# takes ~0.1 ms, while a cold worker pool takes ~0.5 s to start (each spawned worker
+# re-imports this module and rebuilds the analyzer) and even a warm one adds ~10-30 ms per
+# call, so sentences are scored serially unless `--serve --workers N` has started a warm
+# pool and the article has at least this many sentences
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+MIN_PARALLEL_SENTENCES = 2000
+
+# Warm process pool of the long-lived --serve mode, see start_sentence_pool()
+sentence_pool = None
+sentence_workers = 1
+
+def sentiment_label(compound):
+    if compound >= 0.05:
+        return "Positive"
+    elif compound <= -0.05:
+        return "Negative"
+    return "Neutral"
+
 def analyze_sentiment_vader(text):
     """Performs sentiment analysis using VADER."""
-    analyzer = SentimentIntensityAnalyzer()
     sentiment = analyzer.polarity_scores(text)
     
     pos_percent = sentiment['pos'] * 100
     neu_percent = sentiment['neu'] * 100
     neg_percent = sentiment['neg'] * 100
 
-    if sentiment['compound'] >= 0.05:
-        label = "Positive"
-    elif sentiment['compound'] <= -0.05:
-        label = "Negative"
-    else:
-        label = "Neutral"
+    label = sentiment_label(sentiment['compound'])
     
     return {"sentiment": label, "score": sentiment['compound'], "positive": pos_percent, "neutral": neu_percent, "negative": neg_percent}
 
-if __name__ == "__main__":
-    input_data = json.loads(sys.argv[1])  # Get input text from server.js
+def analyze_sentiment_batch(texts):
+    """Scores several texts with the shared analyzer, one result per text in input order."""
+    return [analyze_sentiment_vader(text) for text in texts]
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+def start_sentence_pool(workers):
+    """
+    Starts the process pool sentence mode uses for very long articles, once per process,
+    and loads the analyzer in every worker up front so no request pays for it.
+    """
+    global sentence_pool, sentence_workers
+    if sentence_pool is None and workers > 1:
+        sentence_pool = ProcessPoolExecutor(max_workers=workers)
+        sentence_workers = workers
+        list(sentence_pool.map(analyze_sentiment_vader, ["warm up"] * workers))
+    return sentence_pool
+
+def analyze_sentiment_sentences(text):
+    """
+    Scores each sentence of an article separately, in the warm worker pool for very long
+    articles when one was started, and aggregates them into the analyze_sentiment_vader schema plus a per-sentence
+    "sentences" breakdown. Overall scores are averages weighted by sentence word count.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return {**analyze_sentiment_vader(text), "sentences": []}
+
+    if sentence_pool is not None and len(sentences) >= MIN_PARALLEL_SENTENCES:
+        chunksize = max(1, len(sentences) // (sentence_workers * 4))
+        scores = list(sentence_pool.map(analyze_sentiment_vader, sentences, chunksize=chunksize))
+    else:
+        scores = analyze_sentiment_batch(sentences)
+
+    weights = [len(sentence.split()) for sentence in sentences]
+    total_weight = sum(weights)
+
+    def weighted_mean(key):
+        return sum(score[key] * weight for score, weight in zip(scores, weights)) / total_weight
+
+    compound = round(weighted_mean("score"), 4)
+    return {
+        "sentiment": sentiment_label(compound),
+        "score": compound,
+        "positive": weighted_mean("positive"),
+        "neutral": weighted_mean("neutral"),
+        "negative": weighted_mean("negative"),
+        "sentences": [{"text": sentence, **score} for sentence, score in zip(sentences, scores)],
+    }
+
+def analyze(input_data):
+    """Scores a request from server.js; {"mode": "sentences"} opts into sentence-level scoring."""
     input_text = input_data.get("input_text", "")
+    if not input_text:
+        return {"error": "No input text provided"}
+    if input_data.get("mode") == "sentences":
+        return analyze_sentiment_sentences(input_text)
+    return analyze_sentiment_vader(input_text)
 
-    if input_text:
-        result = analyze_sentiment_vader(input_text)
+def serve(stdin=sys.stdin, stdout=sys.stdout):
+    """
+    Streams JSON lines ({"id": ..., "input_text": ...}) from stdin to JSON result lines on
+    stdout, e.g. for backfilling the articles collection in a single process.
+    """
+    for line in stdin:
+        if not line.strip():
+            continue
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            result = {"id": request_id, **analyze(request)}
+        except (ValueError, TypeError, AttributeError) as e:
+            result = {"id": request_id, "error": f"Invalid request: {e}"}
+
+        # Flush each result so a client waiting on a pipe gets its answer straight away
+        stdout.write(json.dumps(result) + "\n")
+        stdout.flush()
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        parser = argparse.ArgumentParser(prog="predict.py --serve", description="Score JSON lines from stdin.")
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes for sentence mode on very long articles")
+        args = parser.parse_args(sys.argv[2:])
+        start_sentence_pool(args.workers)
+        serve()
     else:
-        result = {"error": "No input text provided"}
+        input_data = json.loads(sys.argv[1])  # Get input text from server.js
+        result = analyze(input_data)
 
-    print(json.dumps(result))  # Send output back to server.js
\ No newline at end of file
+        print(json.dumps(result))  # Send output back to server.js
@@ -7,7 +7,7 @@ app.use(express.json());
 app.use(cors());
 
 app.post("/analyse_sentiment_analysis", async (req, res) => {
-    const { input_text } = req.body;
+    const { input_text, mode } = req.body;
     if (!input_text) {
         return res.status(400).json({ error: "Text input is required" });
     }
@@ -16,7 +16,7 @@ app.post("/analyse_sentiment_analysis", async (req, res) => {
         mode: "text",
         pythonOptions: ["-u"],
         scriptPath: new URL(".", import.meta.url).pathname.substring(3),
-        args: [JSON.stringify({ input_text })],
+        args: [JSON.stringify({ input_text, mode })], // mode: "sentences" adds a per-sentence breakdown
     };
 
     PythonShell.run("predict.py", options)